@@ -0,0 +1,691 @@
+import gc
+from contextlib import closing
+from sparse import normalize_sparse
+
+
+class ArrayDancingLinks:
+    """
+    Dancing Links engine that stores the whole matrix in flat integer lists.
+
+    This follows the layout of Knuth's DLX1: column headers ("items") are numbered
+    1..N and linked horizontally through `llink`/`rlink`, while every matrix entry is
+    a plain integer index into the `top`/`ulink`/`dlink` lists. The entries of a row
+    are stored contiguously; instead of Knuth's spacer nodes, each node refers to a
+    shared tuple of its row's node indices, which CPython walks much faster with a
+    `for` loop than by chasing left/right links.
+
+    Only primary columns are kept in the list rooted at index 0; secondary columns
+    live in their own list, so the column choice never has to look at them.
+    """
+
+    def __init__(self, columns):
+        """
+        columns: list of tuples (col_name, is_primary)
+        """
+        self.names = ["header"]  # Column names by index; index 0 is the root header
+        self.columns = {}  # Map from column name to column index
+        primaries = []
+        secondaries = []
+        for name, is_primary in columns:
+            index = len(self.names)
+            self.columns[name] = index
+            self.names.append(name)
+            if is_primary:
+                primaries.append(index)
+            else:
+                secondaries.append(index)
+
+        count = len(self.names) - 1
+        self.secondary = count + 1  # Head of the secondary column list
+        self.llink = [0] * (count + 2)
+        self.rlink = [0] * (count + 2)
+        self._link_ring(0, primaries)
+        self._link_ring(self.secondary, secondaries)
+
+        # Node storage. Indices 1..count are the column headers, whose up/down links
+        # start out pointing at themselves; `size` holds each column's length.
+        self.size = [0] * (count + 1)
+        self.top = [0] * (count + 1)  # Column of each node
+        self.ulink = list(range(count + 1))
+        self.dlink = list(range(count + 1))
+        self.row_nodes = [()] * (count + 1)  # Node indices of the row each node belongs to
+        self.node_row = [-1] * (count + 1)  # Row index of each node
+
+        self.row_data = []  # Payload of each row, by row index
+        self.row_start = []  # First node of each row, by row index
+        self.heuristic = None  # Column choice strategy; None is the built-in MRV
+        self.forced_rows = []  # Rows forced into every solution, see force_rows()
+
+    def _link_ring(self, head, items):
+        """
+        Link the given column indices into a circular list rooted at `head`.
+        """
+        last = head
+        for item in items:
+            self.llink[item] = last
+            self.rlink[last] = item
+            last = item
+        self.rlink[last] = head
+        self.llink[head] = last
+
+    def add_row(self, row, row_data=None):
+        """
+        Add a row to the DLX matrix.
+          row: list of column names where the row has a 1.
+          row_data: optional data associated with the row (e.g. (i, j)).
+        """
+        if not row:
+            return
+        top, ulink, dlink, size = self.top, self.ulink, self.dlink, self.size
+        start = len(top)
+        nodes = tuple(range(start, start + len(row)))
+        index = len(self.row_data)
+        # Reuse the int objects from `nodes` for every link, so each node index is
+        # stored once rather than once per list.
+        for x, col_name in zip(nodes, row):
+            c = self.columns[col_name]
+            # Link the new node into the bottom of the column.
+            last = ulink[c]
+            top.append(c)
+            ulink.append(last)
+            dlink.append(c)
+            dlink[last] = x
+            ulink[c] = x
+            size[c] += 1
+        self.row_nodes.extend([nodes] * len(nodes))
+        self.node_row.extend([index] * len(nodes))
+        self.row_data.append(row_data)
+        self.row_start.append(start)
+
+    def add_rows(self, rows):
+        """
+        Add many rows at once, e.g. while streaming a large matrix from a file.
+
+        Equivalent to calling add_row() for each row, but with the attribute lookups
+        hoisted out of the loop and the cyclic garbage collector paused meanwhile: the
+        new nodes are never garbage, and collecting while allocating millions of them
+        dominates the build time. `rows` may be any iterable, including a generator.
+          rows: iterable of (row, row_data) pairs, with row as in add_row().
+        """
+        columns = self.columns
+        top, ulink, dlink, size = self.top, self.ulink, self.dlink, self.size
+        row_nodes, node_row = self.row_nodes, self.node_row
+        data_list, row_start = self.row_data, self.row_start
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for row, row_data in rows:
+                if not row:
+                    continue
+                start = len(top)
+                nodes = tuple(range(start, start + len(row)))
+                index = len(data_list)
+                for x, col_name in zip(nodes, row):
+                    c = columns[col_name]
+                    last = ulink[c]
+                    top.append(c)
+                    ulink.append(last)
+                    dlink.append(c)
+                    dlink[last] = x
+                    ulink[c] = x
+                    size[c] += 1
+                row_nodes.extend([nodes] * len(nodes))
+                node_row.extend([index] * len(nodes))
+                data_list.append(row_data)
+                row_start.append(start)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    @classmethod
+    def from_sparse(cls, columns, indptr, indices, row_data=None):
+        """
+        Build a matrix in one pass from a CSR-style sparse description.
+
+        Takes the same arguments as DancingLinks.from_sparse(): row r covers the
+        column positions indices[indptr[r]:indptr[r + 1]] (0-based in `columns`).
+        """
+        dlx = cls(columns)
+        dlx.add_sparse(indptr, indices, row_data)
+        return dlx
+
+    def add_sparse(self, indptr, indices, row_data=None):
+        """
+        Add rows given as integer column positions in CSR form; see from_sparse().
+
+        The node arrays are extended in bulk: a position k is header k + 1, so `top`
+        is filled with one list extension, and a single pass over the new rows
+        threads the up/down links through a per-column "last node" table. As in
+        add_row(), each row's node tuple is made first and its int objects are the
+        ones stored in the link lists, so each node index is stored once.
+
+        Raises:
+            ValueError: If indptr/indices/row_data are inconsistent or a position is
+                out of range.
+        """
+        count = len(self.names) - 1
+        indptr, indices, row_data = normalize_sparse(indptr, indices, row_data, count)
+        top, ulink, dlink, size = self.top, self.ulink, self.dlink, self.size
+        base = len(top)
+
+        # Column of every new node, sharing the header int objects as add_row() does.
+        headers = list(self.columns.values())
+        top.extend([headers[k] for k in indices])
+        last = ulink[:count + 1]  # Current bottom node of each column
+        ulink.extend([0] * len(indices))
+        dlink.extend([0] * len(indices))
+
+        # Row membership, skipping empty rows as add_row() does, and the vertical
+        # links of each row's nodes.
+        row_nodes, node_row = self.row_nodes, self.node_row
+        data_list, row_start = self.row_data, self.row_start
+        for r in range(len(indptr) - 1):
+            lo, hi = base + indptr[r], base + indptr[r + 1]
+            if lo == hi:
+                continue
+            nodes = tuple(range(lo, hi))
+            for x in nodes:
+                c = top[x]
+                above = last[c]
+                ulink[x] = above
+                dlink[above] = x
+                last[c] = x
+                size[c] += 1
+            row_nodes.extend([nodes] * len(nodes))
+            node_row.extend([len(data_list)] * len(nodes))
+            data_list.append(row_data[r])
+            row_start.append(nodes[0])
+        for c in headers:
+            dlink[last[c]] = c
+            ulink[c] = last[c]
+
+    def clone(self):
+        """
+        Return an independent copy of the matrix in its current state.
+
+        Every list is copied with a single C-level slice; the per-row node tuples
+        and the row_data values are immutable and shared. This makes a fresh matrix
+        from a prebuilt template (see templates.py) far faster than building one.
+        """
+        dlx = object.__new__(type(self))
+        dlx.__dict__.update(self.__dict__)
+        for name in ("names", "llink", "rlink", "size", "top", "ulink", "dlink", "row_nodes", "node_row",
+                     "row_data", "row_start", "forced_rows"):
+            setattr(dlx, name, getattr(self, name)[:])
+        dlx.columns = dict(self.columns)
+        return dlx
+
+    def cover(self, c):
+        """
+        Cover column c to remove it and its rows from the matrix.
+        """
+        top, ulink, dlink, size, row_nodes = self.top, self.ulink, self.dlink, self.size, self.row_nodes
+        # For each row in this column, remove all other nodes in that row
+        p = dlink[c]
+        while p != c:
+            for q in row_nodes[p]:
+                if q != p:
+                    u = ulink[q]
+                    d = dlink[q]
+                    dlink[u] = d
+                    ulink[d] = u
+                    size[top[q]] -= 1
+            p = dlink[p]
+        # Remove column header from header list
+        left = self.llink[c]
+        right = self.rlink[c]
+        self.rlink[left] = right
+        self.llink[right] = left
+
+    def uncover(self, c):
+        """
+        Uncover column c, restoring it and its rows into the matrix.
+        """
+        top, ulink, dlink, size, row_nodes = self.top, self.ulink, self.dlink, self.size, self.row_nodes
+        # Re-link the column header into header list
+        left = self.llink[c]
+        right = self.rlink[c]
+        self.rlink[left] = c
+        self.llink[right] = c
+        # For each row in reverse order, restore all nodes in that row
+        p = ulink[c]
+        while p != c:
+            for q in reversed(row_nodes[p]):
+                if q != p:
+                    dlink[ulink[q]] = q
+                    ulink[dlink[q]] = q
+                    size[top[q]] += 1
+            p = ulink[p]
+
+    def select_row(self, index):
+        """
+        Cover every column of row `index`, as if the search had chosen that row.
+        """
+        top = self.top
+        for x in self.row_nodes[self.row_start[index]]:
+            self.cover(top[x])
+
+    def deselect_row(self, index):
+        """
+        Undo select_row(index); rows must be deselected in reverse order.
+        """
+        top = self.top
+        for x in reversed(self.row_nodes[self.row_start[index]]):
+            self.uncover(top[x])
+
+    def prefixes(self, depth):
+        """
+        List the roots of the search subtrees `depth` levels below the top, each as a
+        tuple of row indices that can be replayed with select_row().
+        """
+        found = []
+        self._collect_prefixes(depth, (), found)
+        return found
+
+    def _collect_prefixes(self, depth, prefix, found):
+        c = self.choose_column()
+        if depth == 0 or c == 0:
+            found.append(prefix)
+            return
+        top, dlink, row_nodes, node_row = self.top, self.dlink, self.row_nodes, self.node_row
+        self.cover(c)
+        r = dlink[c]
+        while r != c:
+            nodes = row_nodes[r]
+            for j in nodes:
+                if j != r:
+                    self.cover(top[j])
+            self._collect_prefixes(depth - 1, prefix + (node_row[r],), found)
+            for j in reversed(nodes):
+                if j != r:
+                    self.uncover(top[j])
+            r = dlink[r]
+        self.uncover(c)
+
+    def search(self, solution, results):
+        """
+        Search for solutions.
+        'solution' is the partial solution (list of node indices of chosen rows).
+        'results' collects complete solutions as lists of row_data.
+
+        Runs on the same inlined loop as iter_solutions().
+        """
+        with closing(self._iter_search(solution)) as solutions:
+            for found in solutions:
+                results.append(list(found))
+
+    def choose_column(self):
+        """
+        Return the column to branch on, or 0 if every primary column is already
+        covered.
+
+        By default this is the primary column with the fewest nodes (MRV), the first
+        one on ties; the scan stops early at an empty column, which cannot be beaten.
+        See set_heuristic() for other strategies.
+        """
+        if self.heuristic is not None:
+            columns = self.primary_columns()
+            return self.heuristic(self, columns) if columns else 0
+        rlink, size = self.rlink, self.size
+        c = rlink[0]
+        if c == 0:
+            return 0
+        s = size[c]
+        j = rlink[c]
+        while s and j:
+            if size[j] < s:
+                c = j
+                s = size[j]
+            j = rlink[j]
+        return c
+
+    def set_heuristic(self, heuristic):
+        """
+        Install a column choice strategy; see DancingLinks.set_heuristic().
+        """
+        self.heuristic = heuristic
+
+    def find_one(self, randomize=False, seed=None, restarts="luby"):
+        """
+        Return the first solution found as a tuple of row_data, or None if there is none.
+
+        Stops as soon as one solution is found; with randomize, rows are tried in a
+        random order with restarts. See first_solution.find_one() for details.
+        """
+        from first_solution import find_one
+        return find_one(self, randomize=randomize, seed=seed, restarts=restarts)[0]
+
+    def force_rows(self, rows):
+        """
+        Cover the columns of the given rows up front, so every solution contains them.
+        Validated first; undone with release_rows(). See preassign.force_rows().
+        """
+        from preassign import force_rows
+        force_rows(self, rows)
+
+    def release_rows(self, count=None):
+        """
+        Undo the last `count` forced rows (all by default).
+        """
+        from preassign import release_rows
+        release_rows(self, count)
+
+    def forcing(self, rows):
+        """
+        Return a context manager that forces rows for the duration of a with block.
+        """
+        from preassign import forcing
+        return forcing(self, rows)
+
+    def _row_others(self):
+        """
+        Return, for every node, the other nodes of its row, so the inlined cover and
+        uncover loops of count() and _iter_search() need no `q != p` test.
+        """
+        return [tuple(q for q in nodes if q != p) for p, nodes in enumerate(self.row_nodes)]
+
+    def count(self):
+        """
+        Count the solutions without materializing them, as an exact Python int.
+
+        This is the hot loop of --count-only, so cover() and uncover() are inlined over
+        local bindings of the link lists rather than called per column, and the last
+        primary column is counted by its size instead of being branched on.
+        """
+        llink, rlink, top, ulink, dlink, size = self.llink, self.rlink, self.top, self.ulink, self.dlink, self.size
+        others = self._row_others()
+        choose = self.choose_column if self.heuristic is not None else None
+
+        def visit():
+            if choose is not None:
+                c = choose()
+                if not c:
+                    return 1
+                s = size[c]
+            else:
+                c = rlink[0]
+                if not c:
+                    return 1
+                s = size[c]
+                j = rlink[c]
+                while s and j:
+                    if size[j] < s:
+                        c = j
+                        s = size[j]
+                    j = rlink[j]
+            if not s:
+                return 0
+            if not rlink[c] and not llink[c]:
+                return s  # Last primary column: every row left in it completes a solution
+
+            # cover(c)
+            p = dlink[c]
+            while p != c:
+                for q in others[p]:
+                    u = ulink[q]
+                    d = dlink[q]
+                    dlink[u] = d
+                    ulink[d] = u
+                    size[top[q]] -= 1
+                p = dlink[p]
+            left = llink[c]
+            right = rlink[c]
+            rlink[left] = right
+            llink[right] = left
+
+            total = 0
+            r = dlink[c]
+            while r != c:
+                nodes = others[r]
+                for j in nodes:
+                    # cover(top[j])
+                    col = top[j]
+                    p = dlink[col]
+                    while p != col:
+                        for q in others[p]:
+                            u = ulink[q]
+                            d = dlink[q]
+                            dlink[u] = d
+                            ulink[d] = u
+                            size[top[q]] -= 1
+                        p = dlink[p]
+                    left = llink[col]
+                    right = rlink[col]
+                    rlink[left] = right
+                    llink[right] = left
+                total += visit()
+                for j in reversed(nodes):
+                    # uncover(top[j])
+                    col = top[j]
+                    left = llink[col]
+                    right = rlink[col]
+                    rlink[left] = col
+                    llink[right] = col
+                    p = ulink[col]
+                    while p != col:
+                        for q in reversed(others[p]):
+                            dlink[ulink[q]] = q
+                            ulink[dlink[q]] = q
+                            size[top[q]] += 1
+                        p = ulink[p]
+                r = dlink[r]
+
+            # uncover(c)
+            left = llink[c]
+            right = rlink[c]
+            rlink[left] = c
+            llink[right] = c
+            p = ulink[c]
+            while p != c:
+                for q in reversed(others[p]):
+                    dlink[ulink[q]] = q
+                    ulink[dlink[q]] = q
+                    size[top[q]] += 1
+                p = ulink[p]
+            return total
+
+        return visit()
+
+    def iter_solutions(self, limit=None):
+        """
+        Lazily yield solutions one at a time as tuples of row_data.
+
+        The search stops after `limit` solutions if given, and stopping early (or
+        closing the generator) restores the matrix so it can be searched again.
+        """
+        if limit is not None and limit <= 0:
+            return
+        found = 0
+        with closing(self._iter_search([])) as solutions:
+            for solution in solutions:
+                yield solution
+                found += 1
+                if found == limit:
+                    return
+
+    def _iter_search(self, solution):
+        """
+        Generator version of search(); yields each solution as a tuple of row_data.
+
+        cover() and uncover() are inlined over local bindings as in count(); the
+        finally blocks still restore the matrix if the generator is closed early.
+        """
+        llink, rlink, top, ulink, dlink, size = self.llink, self.rlink, self.top, self.ulink, self.dlink, self.size
+        row_data, node_row = self.row_data, self.node_row
+        others = self._row_others()
+        choose = self.choose_column if self.heuristic is not None else None
+
+        def visit():
+            if choose is not None:
+                c = choose()
+                if not c:
+                    yield tuple(row_data[node_row[x]] for x in solution)
+                    return
+                s = size[c]
+            else:
+                c = rlink[0]
+                if not c:
+                    yield tuple(row_data[node_row[x]] for x in solution)
+                    return
+                s = size[c]
+                j = rlink[c]
+                while s and j:
+                    if size[j] < s:
+                        c = j
+                        s = size[j]
+                    j = rlink[j]
+            if not s:
+                return
+
+            # cover(c)
+            p = dlink[c]
+            while p != c:
+                for q in others[p]:
+                    u = ulink[q]
+                    d = dlink[q]
+                    dlink[u] = d
+                    ulink[d] = u
+                    size[top[q]] -= 1
+                p = dlink[p]
+            left = llink[c]
+            right = rlink[c]
+            rlink[left] = right
+            llink[right] = left
+
+            try:
+                r = dlink[c]
+                while r != c:
+                    solution.append(r)
+                    nodes = others[r]
+                    for j in nodes:
+                        # cover(top[j])
+                        col = top[j]
+                        p = dlink[col]
+                        while p != col:
+                            for q in others[p]:
+                                u = ulink[q]
+                                d = dlink[q]
+                                dlink[u] = d
+                                ulink[d] = u
+                                size[top[q]] -= 1
+                            p = dlink[p]
+                        left = llink[col]
+                        right = rlink[col]
+                        rlink[left] = right
+                        llink[right] = left
+                    try:
+                        yield from visit()
+                    finally:
+                        solution.pop()
+                        for j in reversed(nodes):
+                            # uncover(top[j])
+                            col = top[j]
+                            left = llink[col]
+                            right = rlink[col]
+                            rlink[left] = col
+                            llink[right] = col
+                            p = ulink[col]
+                            while p != col:
+                                for q in reversed(others[p]):
+                                    dlink[ulink[q]] = q
+                                    ulink[dlink[q]] = q
+                                    size[top[q]] += 1
+                                p = ulink[p]
+                    r = dlink[r]
+            finally:
+                # uncover(c)
+                left = llink[c]
+                right = rlink[c]
+                rlink[left] = c
+                llink[right] = c
+                p = ulink[c]
+                while p != c:
+                    for q in reversed(others[p]):
+                        dlink[ulink[q]] = q
+                        ulink[dlink[q]] = q
+                        size[top[q]] += 1
+                    p = ulink[p]
+
+        return visit()
+
+    # Engine-neutral primitives; see the matching block in dancing_links.py.
+
+    def column_name(self, c):
+        """
+        Return the name of a column.
+        """
+        return self.names[c]
+
+    def column_size(self, c):
+        """
+        Return the number of rows currently in a column.
+        """
+        return self.size[c]
+
+    def first_row(self, c):
+        """
+        Return the node of the first row in a column (the column itself if empty).
+        """
+        return self.dlink[c]
+
+    def next_row(self, x):
+        """
+        Return the node of the next row in the same column.
+        """
+        return self.dlink[x]
+
+    def row_length(self, x):
+        """
+        Return the number of columns in the row containing node x.
+        """
+        return len(self.row_nodes[x])
+
+    def row_columns(self, x):
+        """
+        Return the columns of x's row other than x's own column, in cover order.
+        """
+        top = self.top
+        return [top[j] for j in self.row_nodes[x] if j != x]
+
+    def cover_row(self, x):
+        """
+        Cover the columns of x's row other than x's own column.
+        """
+        top = self.top
+        for j in self.row_nodes[x]:
+            if j != x:
+                self.cover(top[j])
+
+    def uncover_row(self, x):
+        """
+        Undo cover_row(x).
+        """
+        top = self.top
+        for j in reversed(self.row_nodes[x]):
+            if j != x:
+                self.uncover(top[j])
+
+    def primary_columns(self):
+        """
+        Return the uncovered primary columns, in header order.
+        """
+        rlink = self.rlink
+        columns = []
+        j = rlink[0]
+        while j:
+            columns.append(j)
+            j = rlink[j]
+        return columns
+
+    def row_items(self, index):
+        """
+        Return every column of row `index`, in row order.
+        """
+        top = self.top
+        return [top[x] for x in self.row_nodes[self.row_start[index]]]
+
+    def row_of(self, x):
+        """
+        Return the row index of the row containing node x.
+        """
+        return self.node_row[x]
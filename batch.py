@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from first_solution import find_one
+from ordering import format_spec, ordered_builder, parse_spec
+from solutions import to_permutation
+from templates import BUILDERS, LABELS, build_from_template
+
+ENGINES = ("linked", "array")
+MODES = ("count", "solve", "first")
+
+
+def normalize_job(job):
+    """
+    Validate one batch job and fill in its defaults.
+
+    A job is a dict with the board size "n" and optionally "engine" ("linked" or
+    "array", default linked), "ordering" (a built-in ordering of templates.py,
+    "original" or "organ" (default), or an ordering spec such as
+    "organ,identity,diagonal"; see ordering.py), "mode" ("count" (default),
+    "solve" or "first"), "seed" (for random orderings and "first") and "id" (echoed
+    back in the result).
+
+    Returns:
+        dict: A new job dict with every key set.
+
+    Raises:
+        ValueError: For a missing or invalid field.
+    """
+    if not isinstance(job, dict):
+        raise ValueError(f"a job must be a JSON object, not {job!r}")
+    n = job.get("n")
+    if not isinstance(n, int) or isinstance(n, bool) or n < 1:
+        raise ValueError(f"job 'n' must be a positive integer, not {n!r}")
+    engine = job.get("engine", "linked")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Choose from: {', '.join(ENGINES)}")
+    mode = job.get("mode", "count")
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Choose from: {', '.join(MODES)}")
+    ordering = job.get("ordering", "organ")
+    if ordering not in BUILDERS:
+        ordering = format_spec(parse_spec(str(ordering)))
+    return {"id": job.get("id"), "n": n, "engine": engine, "ordering": ordering, "mode": mode,
+            "seed": job.get("seed")}
+
+
+def job_label(job):
+    """
+    Return the label used for a job in progress messages, e.g. "Organ Pipe".
+    """
+    return LABELS.get(job["ordering"], job["ordering"])
+
+
+def _estimated_cost(job):
+    """
+    Sort key for largest-first scheduling: full searches grow steeply with n, while
+    a first solution with restarts stays cheap, so those go last.
+    """
+    return (job["mode"] != "first", job["n"])
+
+
+def run_job(job):
+    """
+    Run one normalized job in the current process and return its result.
+
+    Returns:
+        dict: The job's fields plus "count" (solutions found), "solution" (the first
+            solution as a permutation, or None; "count" mode finds none), "build"
+            and "elapsed" (seconds, build included) and "worker" (process id).
+    """
+    start = time.perf_counter()
+    n = job["n"]
+    if job["ordering"] in BUILDERS:
+        # Workers are persistent, so repeated sizes are cloned from an in-memory template.
+        dlx = build_from_template(job["ordering"], n, job["engine"])
+    else:
+        dlx = ordered_builder(job["ordering"], job["seed"])(n, job["engine"])
+    build_time = time.perf_counter() - start
+
+    solution = None
+    if job["mode"] == "count":
+        count = dlx.count()
+    elif job["mode"] == "first":
+        found, _, _ = find_one(dlx, randomize=True, seed=job["seed"])
+        count = 0 if found is None else 1
+        solution = None if found is None else to_permutation(found, n)
+    else:
+        count = 0
+        for found in dlx.iter_solutions():
+            if solution is None:
+                solution = to_permutation(found, n)
+            count += 1
+
+    return dict(job, count=count, solution=None if solution is None else list(solution),
+                build=build_time, elapsed=time.perf_counter() - start, worker=os.getpid())
+
+
+class BatchRunner:
+    """
+    Persistent process pool that runs batches of n-Queens jobs, largest first.
+
+    The pool is created once and reused for every batch, so workers pay the
+    interpreter startup and import cost only once. Within a batch, the most
+    expensive jobs are submitted first so a big board never starts last and
+    stretches the whole batch; results are yielded as soon as each job finishes.
+    """
+
+    def __init__(self, jobs=None):
+        """
+        Args:
+            jobs (int | None): Number of worker processes; defaults to the CPU count.
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+
+    def run(self, jobs):
+        """
+        Run a batch of jobs and yield their results in completion order.
+
+        Args:
+            jobs (iterable[dict]): Jobs as accepted by normalize_job().
+
+        Yields:
+            dict: One result per job, as returned by run_job(); a job that is invalid
+                or fails yields its fields plus "error" instead, and the batch goes on.
+        """
+        pending = []
+        for job in jobs:
+            try:
+                pending.append(normalize_job(job))
+            except ValueError as e:
+                yield {"id": job.get("id") if isinstance(job, dict) else None, "error": str(e)}
+        pending.sort(key=_estimated_cost, reverse=True)
+        futures = {self.executor.submit(run_job, job): job for job in pending}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:  # Reported per job, like invalid input
+                yield dict(futures[future], error=f"{type(e).__name__}: {e}")
+
+    def close(self):
+        """
+        Shut the worker processes down.
+        """
+        self.executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _run_lines(runner, lines, emit):
+    """
+    Run the jobs read from JSON lines and pass each result to `emit` as it finishes.
+
+    Each line is one job object or a list of them; blank lines are skipped, and a
+    malformed line is reported as an error result instead of ending the batch.
+    """
+    jobs = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError as e:
+            emit({"id": None, "error": f"line {number}: invalid JSON ({e.msg})"})
+            continue
+        jobs.extend(entry if isinstance(entry, list) else (entry,))
+    for result in runner.run(jobs):
+        emit(result)
+
+
+def serve(runner, host="127.0.0.1", port=8765):
+    """
+    Serve batches over HTTP: POST JSON-lines jobs (or a JSON list) to any path and
+    read the JSON-lines results back as each job finishes. All requests share the
+    runner's worker pool.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    lock = threading.Lock()  # One batch at a time, so largest-first holds across requests
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.0"  # Stream until the connection closes
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            with lock:
+                _run_lines(runner, body.splitlines(), self.emit)
+
+        def emit(self, result):
+            self.wfile.write((json.dumps(result) + "\n").encode())
+            self.wfile.flush()
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Serving n-Queens batches on http://{host}:{port}/ (POST JSON-lines jobs)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    """
+    Command-line entrypoint: run JSON-lines jobs from stdin, or serve them over HTTP.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run many n-Queens jobs on a shared worker pool and stream JSON-lines results."
+    )
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("--serve", type=int, metavar="PORT", default=None,
+                        help="serve batches over HTTP on this port instead of reading stdin")
+    parser.add_argument("--host", default="127.0.0.1", help="with --serve, address to bind (default: 127.0.0.1)")
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    with BatchRunner(args.jobs) as runner:
+        if args.serve is not None:
+            serve(runner, args.host, args.serve)
+        else:
+            def emit(result):
+                print(json.dumps(result), flush=True)
+
+            _run_lines(runner, sys.stdin, emit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import argparse
+import csv
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from bitboard import count_queens, iter_bitboard
+from nqueens import build_n_queens
+from organpipe import build_nq_organ
+from solutions import SolutionSet, to_permutation
+from symmetry import orbit, unique_solutions
+
+
+def _dlx_search(mode):
+    """
+    Return the search step for a DLX configuration in the given mode.
+    """
+    if mode == "count":
+        return lambda dlx, n: dlx.count()
+    return lambda dlx, n: len(SolutionSet(n, (to_permutation(s, n) for s in dlx.iter_solutions())))
+
+
+def _bitboard_search(mode):
+    """
+    Return the search step for the bitboard baseline, which has no build phase.
+    """
+    if mode == "count":
+        return lambda _, n: count_queens(n)
+    return lambda _, n: len(SolutionSet(n, iter_bitboard(n)))
+
+
+def _symmetric_search(mode):
+    """
+    Return the search step for the half-board search, which builds its own matrix.
+    """
+    def expand(n):
+        return (image for perm in unique_solutions(build_n_queens, n) for image in orbit(perm))
+    if mode == "count":
+        return lambda _, n: sum(1 for _ in expand(n))
+    return lambda _, n: len(SolutionSet(n, expand(n)))
+
+
+# Benchmark configurations: name -> (build(n), search factory by mode).
+CONFIGS = {
+    "original-linked": (lambda n: build_n_queens(n, "linked"), _dlx_search),
+    "organ-linked": (lambda n: build_nq_organ(n, "linked"), _dlx_search),
+    "original-array": (lambda n: build_n_queens(n, "array"), _dlx_search),
+    "organ-array": (lambda n: build_nq_organ(n, "array"), _dlx_search),
+    "bitboard": (lambda n: None, _bitboard_search),
+    "symmetry-linked": (lambda n: None, _symmetric_search),
+}
+
+
+def _summarize(samples):
+    """
+    Return the median and interquartile range of a list of timings.
+    """
+    if len(samples) < 2:
+        return samples[0], 0.0
+    q1, _, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    return statistics.median(samples), q3 - q1
+
+
+def run_config(name, n, mode="count", repeat=5, warmup=1):
+    """
+    Benchmark one configuration on one board size.
+
+    Build and search are timed separately with perf_counter. The first `warmup`
+    runs are discarded, and peak memory is measured in one extra run under
+    tracemalloc so the tracing overhead never skews the timings.
+
+    Args:
+        name (str): Key into CONFIGS.
+        n (int): Board size.
+        mode (str): "count" to count solutions, "solve" to enumerate them.
+        repeat (int): Number of timed runs.
+        warmup (int): Number of untimed runs before the timed ones.
+
+    Returns:
+        dict: Solution count, median/IQR of build and search time, and peak memory.
+    """
+    build, search_factory = CONFIGS[name]
+    search = search_factory(mode)
+    build_times = []
+    search_times = []
+    solutions = None
+    for run in range(warmup + repeat):
+        start = time.perf_counter()
+        dlx = build(n)
+        built = time.perf_counter()
+        solutions = search(dlx, n)
+        done = time.perf_counter()
+        if run >= warmup:
+            build_times.append(built - start)
+            search_times.append(done - built)
+        del dlx
+
+    tracemalloc.start()
+    try:
+        search(build(n), n)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    build_median, build_iqr = _summarize(build_times)
+    search_median, search_iqr = _summarize(search_times)
+    return {
+        "config": name,
+        "n": n,
+        "mode": mode,
+        "solutions": solutions,
+        "repeat": repeat,
+        "build_median": build_median,
+        "build_iqr": build_iqr,
+        "search_median": search_median,
+        "search_iqr": search_iqr,
+        "peak_bytes": peak,
+    }
+
+
+def run_benchmarks(sizes, configs, mode="count", repeat=5, warmup=1):
+    """
+    Run every configuration on every board size and return the list of result rows.
+    """
+    results = []
+    for n in sizes:
+        for name in configs:
+            row = run_config(name, n, mode, repeat, warmup)
+            results.append(row)
+            print(f"{n:>3} | {name:<16} | {row['build_median']:>10.6f} | {row['search_median']:>10.6f} "
+                  f"| {row['search_iqr']:>10.6f} | {row['peak_bytes'] / 1024:>10.1f} | {row['solutions']}")
+    return results
+
+
+def check_agreement(results):
+    """
+    Print every board size on which the configurations disagree on the solution count.
+
+    Returns:
+        bool: True if all configurations agree.
+    """
+    counts = {}
+    for row in results:
+        counts.setdefault(row["n"], {})[row["config"]] = row["solutions"]
+    agree = True
+    for n, by_config in sorted(counts.items()):
+        if len(set(by_config.values())) > 1:
+            agree = False
+            found = ", ".join(f"{name}={count}" for name, count in by_config.items())
+            print(f"Warning: configurations disagree on {n}-Queens: {found}")
+    return agree
+
+
+def print_organ_pipe_effect(results):
+    """
+    Print, per engine and board size, how much organ-pipe ordering speeds up the search.
+    """
+    by_key = {(row["config"], row["n"]): row for row in results}
+    lines = []
+    for (name, n), row in sorted(by_key.items(), key=lambda item: (item[0][1], item[0][0])):
+        if not name.startswith("original-"):
+            continue
+        organ = by_key.get(("organ-" + name[len("original-"):], n))
+        if organ is None or organ["search_median"] <= 0:
+            continue
+        lines.append(f"{n:>3} | {name[len('original-'):]:<8} | {row['search_median'] / organ['search_median']:>8.2f}x")
+    if lines:
+        print("\n=== Organ Pipe Search Speedup (median) ===")
+        print(f"{'N':>3} | {'Engine':<8} | {'Speedup':>9}")
+        print("\n".join(lines))
+
+
+def write_json(path, results):
+    """
+    Write the results plus interpreter/platform metadata as JSON.
+    """
+    document = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def write_csv(path, results):
+    """
+    Write the results as CSV, one row per (configuration, board size).
+    """
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main(argv=None):
+    """
+    Command-line entrypoint: benchmark the selected configurations across board sizes.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark n-Queens engines and orderings.")
+    parser.add_argument("sizes", nargs="+", type=int, help="board sizes to benchmark")
+    parser.add_argument("--configs", default=",".join(CONFIGS),
+                        help=f"comma-separated configurations (default: {','.join(CONFIGS)})")
+    parser.add_argument("--mode", choices=["count", "solve"], default="count",
+                        help="count solutions or enumerate them (default: count)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per configuration (default: 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before timing (default: 1)")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--csv", help="write results to this CSV file")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.warmup < 0:
+        parser.error("--warmup cannot be negative")
+
+    configs = [name.strip() for name in args.configs.split(",") if name.strip()]
+    unknown = [name for name in configs if name not in CONFIGS]
+    if unknown:
+        parser.error(f"unknown configuration(s): {', '.join(unknown)}")
+
+    print(f"{'N':>3} | {'Config':<16} | {'Build (s)':>10} | {'Search (s)':>10} | {'IQR (s)':>10} "
+          f"| {'Peak (KiB)':>10} | Solutions")
+    print("-" * 92)
+    results = run_benchmarks(args.sizes, configs, args.mode, args.repeat, args.warmup)
+    check_agreement(results)
+    print_organ_pipe_effect(results)
+
+    if args.json:
+        write_json(args.json, results)
+    if args.csv:
+        write_csv(args.csv, results)
+
+
+if __name__ == "__main__":
+    main()
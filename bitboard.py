@@ -0,0 +1,122 @@
+import time
+from solutions import SolutionSet, make_permutation
+
+
+def iter_bitboard(n, limit=None):
+    """
+    Lazily yield n-Queens solutions using bitmask backtracking.
+
+    Columns, main diagonals and anti-diagonals attacked by the queens placed so far
+    are kept as integer bitsets, so finding the free squares of a row is a couple of
+    bit operations instead of a DLX column scan.
+
+    Args:
+        n (int): Board size (n x n).
+        limit (int | None): Stop after this many solutions.
+
+    Yields:
+        bytes: One solution as a compact permutation (column per row).
+    """
+    if limit is not None and limit <= 0:
+        return
+    if n == 0:
+        yield make_permutation([])  # The empty placement, as the DLX engines report it
+        return
+    full = (1 << n) - 1
+    placed = []
+    found = 0
+    # Explicit stack of the still-untried free squares of each row.
+    stack = [full]
+    cols = diag = anti = 0
+    history = []
+    while stack:
+        free = stack[-1]
+        if not free:
+            # Row exhausted: backtrack to the previous row.
+            stack.pop()
+            if history:
+                cols, diag, anti = history.pop()
+                placed.pop()
+            continue
+        bit = free & -free  # Lowest free square of the current row
+        stack[-1] = free ^ bit
+        placed.append(bit.bit_length() - 1)
+        if len(placed) == n:
+            yield make_permutation(placed)
+            found += 1
+            if found == limit:
+                return
+            placed.pop()
+            continue
+        history.append((cols, diag, anti))
+        cols |= bit
+        diag = ((diag | bit) << 1) & full
+        anti = (anti | bit) >> 1
+        stack.append(full & ~(cols | diag | anti))
+
+
+def _count(full, cols, diag, anti):
+    """
+    Count the completions of a partial placement given its attacked bitsets.
+    """
+    if cols == full:
+        return 1
+    total = 0
+    free = full & ~(cols | diag | anti)
+    while free:
+        bit = free & -free
+        free ^= bit
+        total += _count(full, cols | bit, ((diag | bit) << 1) & full, (anti | bit) >> 1)
+    return total
+
+
+def count_queens(n):
+    """
+    Return the number of n-Queens solutions, computed with bitmask backtracking.
+    """
+    return _count((1 << n) - 1, 0, 0, 0)  # n = 0: the empty placement, like DLX
+
+
+def count_bitboard(n):
+    """
+    Count the n-Queens solutions with bitmask backtracking.
+
+    Args:
+        n (int): Board size (n x n).
+
+    Returns:
+        tuple: (count, elapsed)
+            count: int, exact number of solutions.
+            elapsed: float, time taken in seconds.
+    """
+    start = time.time()
+
+    count = count_queens(n)
+
+    elapsed = time.time() - start
+    print(f"[Bitboard] Counted {count} solutions for {n}-Queens in {elapsed:.4f} seconds.")
+
+    return count, elapsed
+
+
+def solve_bitboard(n, limit=None):
+    """
+    Solve the n-Queens problem with bitmask backtracking.
+
+    Args:
+        n (int): Board size (n x n).
+        limit (int | None): Stop after this many solutions.
+
+    Returns:
+        tuple: (results, elapsed)
+            results: SolutionSet of solutions packed as permutations.
+            elapsed: float, time taken in seconds.
+    """
+    start = time.time()
+
+    results = SolutionSet(n, iter_bitboard(n, limit))
+
+    elapsed = time.time() - start
+    print(f"[Bitboard] Solved {n}-Queens in {elapsed:.4f} seconds with {len(results)} solutions.")
+
+    return results, elapsed
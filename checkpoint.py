@@ -0,0 +1,87 @@
+import json
+import os
+import time
+from search_driver import SearchDriver
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path, problem, state, elapsed):
+    """
+    Write a checkpoint file atomically, so a crash mid-write never loses the last one.
+
+    Args:
+        path (str): Checkpoint file to (over)write.
+        problem (dict): Describes how to rebuild the matrix, e.g.
+            {"ordering": "organ", "n": 16, "engine": "array"}.
+        state (dict): Search position from SearchDriver.state().
+        elapsed (float): Search time spent so far, in seconds.
+    """
+    document = {
+        "version": CHECKPOINT_VERSION,
+        "problem": problem,
+        "state": state,
+        "elapsed": elapsed,
+    }
+    temp = f"{path}.tmp"
+    with open(temp, "w") as f:
+        json.dump(document, f)
+    os.replace(temp, path)
+
+
+def load_checkpoint(path):
+    """
+    Read a checkpoint file written by save_checkpoint().
+
+    Returns:
+        dict: With keys "problem", "state" and "elapsed".
+
+    Raises:
+        ValueError: If the file is not a checkpoint of a supported version.
+    """
+    with open(path) as f:
+        document = json.load(f)
+    if document.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is not a version {CHECKPOINT_VERSION} checkpoint")
+    return document
+
+
+def count_with_checkpoints(dlx, path, problem, every_seconds=60.0, every_nodes=None,
+                           resume_from=None, budget=10000):
+    """
+    Count the solutions of a matrix, periodically saving the search position.
+
+    Args:
+        dlx (DancingLinks | ArrayDancingLinks): Freshly built matrix to search.
+        path (str): Checkpoint file, rewritten at every checkpoint and at the end.
+        problem (dict): Stored in the checkpoint so the matrix can be rebuilt.
+        every_seconds (float | None): Save at least this often (wall-clock time).
+        every_nodes (int | None): Save every this many search-tree nodes.
+        resume_from (dict | None): A loaded checkpoint to continue from.
+        budget (int): Nodes per search slice between interval checks.
+
+    Returns:
+        tuple: (count, elapsed) with the total over all sessions.
+    """
+    driver = SearchDriver(dlx)
+    elapsed_before = 0.0
+    if resume_from is not None:
+        driver.restore(resume_from["state"])
+        elapsed_before = resume_from["elapsed"]
+
+    if every_nodes:
+        budget = min(budget, every_nodes)
+    start = time.time()
+    last_save = start
+    last_nodes = driver.nodes
+    while not driver.finished:
+        driver.step(budget)
+        now = time.time()
+        due_by_time = every_seconds is not None and now - last_save >= every_seconds
+        due_by_nodes = every_nodes is not None and driver.nodes - last_nodes >= every_nodes
+        if driver.finished or due_by_time or due_by_nodes:
+            save_checkpoint(path, problem, driver.state(), elapsed_before + now - start)
+            last_save = now
+            last_nodes = driver.nodes
+
+    return driver.solutions, elapsed_before + time.time() - start
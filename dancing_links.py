@@ -1,5 +1,12 @@
+import gc
+from contextlib import closing
 from node import Node
 from column_node import ColumnNode
+from importlib import import_module
+from sparse import normalize_sparse
+
+# first_solution, preassign and the array engine are imported where they are used,
+# so that building and searching a linked matrix loads neither.
 
 
 class DancingLinks:
@@ -7,21 +14,28 @@ class DancingLinks:
         """
         columns: list of tuples (col_name, is_primary)
         """
-        # Create the header node.
+        # Create the header nodes. Primary and secondary column headers are kept in
+        # separate circular lists, so choosing a column never scans the secondaries.
         self.header = ColumnNode("header")
+        self.secondary_header = ColumnNode("secondary", primary=False)
         self.columns = {}  # Map from column name to ColumnNode.
-        last = self.header
+        self.rows = []  # First node of each row, by row index.
+        self.row_data = []  # Payload of each row, by row index.
+        self.heuristic = None  # Column choice strategy; None is the built-in MRV
+        self.forced_rows = []  # Rows forced into every solution, see force_rows()
+        last = {True: self.header, False: self.secondary_header}
 
-        # Create column headers and add them to the doubly linked list.
+        # Create column headers and add them to the doubly linked list of their kind.
         for name, is_primary in columns:
             col = ColumnNode(name, primary=is_primary)
             self.columns[name] = col
-            # Insert col into the header's list.
-            col.left = last
-            col.right = self.header
-            last.right = col
-            self.header.left = col
-            last = col
+            head = self.secondary_header if not is_primary else self.header
+            # Insert col at the end of its header list.
+            col.left = last[is_primary]
+            col.right = head
+            last[is_primary].right = col
+            head.left = col
+            last[is_primary] = col
 
     def add_row(self, row, row_data=None):
         """
@@ -35,6 +49,7 @@ class DancingLinks:
             new_node = Node()
             new_node.column = col
             new_node.row_data = row_data
+            new_node.row_index = len(self.rows)
 
             # Link the new node into the bottom of the column.
             new_node.down = col
@@ -54,6 +69,136 @@ class DancingLinks:
                 first_node.left.right = new_node
                 first_node.left = new_node
 
+        if first_node is not None:
+            self.rows.append(first_node)
+            self.row_data.append(row_data)
+
+    def add_rows(self, rows):
+        """
+        Add many rows at once, e.g. while streaming a large matrix from a file.
+
+        Equivalent to calling add_row() for each row, but with the attribute lookups
+        hoisted out of the loop and the cyclic garbage collector paused meanwhile: the
+        new nodes are never garbage, and collecting while allocating millions of them
+        dominates the build time. `rows` may be any iterable, including a generator,
+        so the whole matrix never has to be held in memory twice.
+          rows: iterable of (row, row_data) pairs, with row as in add_row().
+        """
+        columns = self.columns
+        row_list = self.rows
+        data_list = self.row_data
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for row, row_data in rows:
+                index = len(row_list)
+                first_node = None
+                for col_name in row:
+                    col = columns[col_name]
+                    new_node = Node()
+                    new_node.column = col
+                    new_node.row_data = row_data
+                    new_node.row_index = index
+
+                    # Link the new node into the bottom of the column.
+                    last = col.up
+                    new_node.down = col
+                    new_node.up = last
+                    last.down = new_node
+                    col.up = new_node
+                    col.size += 1
+
+                    # Link the new node into the row, before first_node (i.e. at the end).
+                    if first_node is None:
+                        first_node = new_node
+                    else:
+                        end = first_node.left
+                        new_node.left = end
+                        new_node.right = first_node
+                        end.right = new_node
+                        first_node.left = new_node
+
+                if first_node is not None:
+                    row_list.append(first_node)
+                    data_list.append(row_data)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    @classmethod
+    def from_sparse(cls, columns, indptr, indices, row_data=None):
+        """
+        Build a matrix in one pass from a CSR-style sparse description.
+
+        Args:
+            columns (list): Tuples of (col_name, is_primary), as for the constructor.
+            indptr (sequence[int]): Row r covers indices[indptr[r]:indptr[r + 1]];
+                len(indptr) is the number of rows plus one.
+            indices (sequence[int]): Column positions in `columns` (0-based).
+            row_data (sequence | None): Payload of each row, or None for no payloads.
+                NumPy arrays are accepted for all three sequences.
+
+        Returns:
+            DancingLinks: The populated matrix.
+        """
+        dlx = cls(columns)
+        dlx.add_sparse(indptr, indices, row_data)
+        return dlx
+
+    def add_sparse(self, indptr, indices, row_data=None):
+        """
+        Add rows given as integer column positions in CSR form; see from_sparse().
+
+        Unlike add_row(), no column names are looked up: positions index straight into
+        the list of column headers, and the nodes are allocated without running
+        Node.__init__, since every link is assigned here anyway.
+
+        Raises:
+            ValueError: If indptr/indices/row_data are inconsistent or a position is
+                out of range.
+        """
+        headers = list(self.columns.values())
+        indptr, indices, row_data = normalize_sparse(indptr, indices, row_data, len(headers))
+
+        new_node = Node.__new__
+        row_list = self.rows
+        data_list = self.row_data
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for r in range(len(indptr) - 1):
+                lo, hi = indptr[r], indptr[r + 1]
+                if lo == hi:
+                    continue  # Empty rows are skipped, as in add_row()
+                data = row_data[r]
+                index = len(row_list)
+                nodes = [new_node(Node) for _ in range(hi - lo)]
+                last_node = nodes[-1]
+                left = last_node
+                for node, k in zip(nodes, indices[lo:hi]):
+                    col = headers[k]
+                    node.column = col
+                    node.row_data = data
+                    node.row_index = index
+                    # Link into the bottom of the column.
+                    above = col.up
+                    node.up = above
+                    node.down = col
+                    above.down = node
+                    col.up = node
+                    col.size += 1
+                    # Link into the row ring, in order.
+                    node.left = left
+                    left.right = node
+                    left = node
+                last_node.right = nodes[0]
+                nodes[0].left = last_node
+                row_list.append(nodes[0])
+                data_list.append(data)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
     def cover(self, col):
         """
         Cover a column to remove it and its rows from the matrix.
@@ -100,27 +245,13 @@ class DancingLinks:
         'solution' is the partial solution (list of nodes corresponding to chosen rows).
         'results' collects complete solutions.
         """
-        # Check if all primary columns are covered.
-        all_covered = True
-        j = self.header.right
-        while j != self.header:
-            if j.primary:
-                all_covered = False
-                break
-            j = j.right
-        if all_covered:
+        # Choose the primary column with the fewest nodes; none left means every
+        # primary column is covered.
+        c = self.choose_column()
+        if c is None:
             results.append(solution.copy())
             return
-
-        # Choose the primary column with the fewest nodes.
-        c = None
-        j = self.header.right
-        while j != self.header:
-            if j.primary:
-                if c is None or j.size < c.size:
-                    c = j
-            j = j.right
-        if c is None or c.size == 0:
+        if c.size == 0:
             return
 
         # Cover column c and try each row
@@ -147,3 +278,343 @@ class DancingLinks:
 
         # Uncover column c to restore state
         self.uncover(c)
+
+    def select_row(self, index):
+        """
+        Cover every column of row `index`, as if the search had chosen that row.
+        """
+        node = self.rows[index]
+        self.cover(node.column)
+        j = node.right
+        while j != node:
+            self.cover(j.column)
+            j = j.right
+
+    def deselect_row(self, index):
+        """
+        Undo select_row(index); rows must be deselected in reverse order.
+        """
+        node = self.rows[index]
+        j = node.left
+        while j != node:
+            self.uncover(j.column)
+            j = j.left
+        self.uncover(node.column)
+
+    def prefixes(self, depth):
+        """
+        List the roots of the search subtrees `depth` levels below the top.
+
+        Each prefix is a tuple of row indices chosen in search order; replaying it
+        with select_row() and searching from there visits exactly that subtree.
+        Solutions shorter than `depth` appear as complete prefixes.
+        """
+        found = []
+        self._collect_prefixes(depth, (), found)
+        return found
+
+    def _collect_prefixes(self, depth, prefix, found):
+        c = self.choose_column()
+        if depth == 0 or c is None:
+            found.append(prefix)
+            return
+        self.cover(c)
+        r = c.down
+        while r != c:
+            j = r.right
+            while j != r:
+                self.cover(j.column)
+                j = j.right
+            self._collect_prefixes(depth - 1, prefix + (r.row_index,), found)
+            j = r.left
+            while j != r:
+                self.uncover(j.column)
+                j = j.left
+            r = r.down
+        self.uncover(c)
+
+    def choose_column(self):
+        """
+        Return the column to branch on, or None if every primary column is already
+        covered.
+
+        By default this is the primary column with the fewest nodes (MRV), the first
+        one on ties; the scan stops early at an empty column, which cannot be beaten.
+        See set_heuristic() for other strategies.
+        """
+        if self.heuristic is not None:
+            columns = self.primary_columns()
+            return self.heuristic(self, columns) if columns else None
+        header = self.header
+        c = header.right
+        if c is header:
+            return None
+        s = c.size
+        j = c.right
+        while s and j is not header:
+            if j.size < s:
+                c = j
+                s = j.size
+            j = j.right
+        return c
+
+    def set_heuristic(self, heuristic):
+        """
+        Install a column choice strategy, used by every search method and driver.
+
+        Args:
+            heuristic (callable | None): Called as heuristic(dlx, columns) with the
+                uncovered primary columns in header order (never empty); returns one
+                of them. None restores the built-in MRV. See heuristics.py.
+        """
+        self.heuristic = heuristic
+
+    def find_one(self, randomize=False, seed=None, restarts="luby"):
+        """
+        Return the first solution found as a tuple of row_data, or None if there is none.
+
+        Stops as soon as one solution is found; with randomize, rows are tried in a
+        random order with restarts. See first_solution.find_one() for details.
+        """
+        from first_solution import find_one
+        return find_one(self, randomize=randomize, seed=seed, restarts=restarts)[0]
+
+    def force_rows(self, rows):
+        """
+        Cover the columns of the given rows up front, so every solution contains them.
+        Validated first; undone with release_rows(). See preassign.force_rows().
+        """
+        from preassign import force_rows
+        force_rows(self, rows)
+
+    def release_rows(self, count=None):
+        """
+        Undo the last `count` forced rows (all by default).
+        """
+        from preassign import release_rows
+        release_rows(self, count)
+
+    def forcing(self, rows):
+        """
+        Return a context manager that forces rows for the duration of a with block.
+        """
+        from preassign import forcing
+        return forcing(self, rows)
+
+    def count(self):
+        """
+        Count the solutions without materializing them.
+
+        Only leaf hits are added up, so neither `results` nor any row_data is
+        touched. The total is an exact Python int.
+        """
+        c = self.choose_column()
+        if c is None:
+            return 1
+        if c.size == 0:
+            return 0
+
+        total = 0
+        self.cover(c)
+        r = c.down
+        while r != c:
+            j = r.right
+            while j != r:
+                self.cover(j.column)
+                j = j.right
+            total += self.count()
+            j = r.left
+            while j != r:
+                self.uncover(j.column)
+                j = j.left
+            r = r.down
+        self.uncover(c)
+        return total
+
+    def iter_solutions(self, limit=None):
+        """
+        Lazily yield solutions one at a time instead of collecting them in a list.
+
+        Each solution is a tuple of the row_data of its chosen rows, so no DLX nodes
+        are kept alive once it has been yielded. The search stops after `limit`
+        solutions if given, and stopping early (or closing the generator) restores
+        the matrix so it can be searched again.
+        """
+        if limit is not None and limit <= 0:
+            return
+        found = 0
+        with closing(self._iter_search([])) as solutions:
+            for solution in solutions:
+                yield solution
+                found += 1
+                if found == limit:
+                    return
+
+    def _iter_search(self, solution):
+        """
+        Generator version of search(); yields each solution as a tuple of row_data.
+        """
+        c = self.choose_column()
+        if c is None:
+            yield tuple(node.row_data for node in solution)
+            return
+        if c.size == 0:
+            return
+
+        # Cover column c and try each row; the finally blocks undo the covers
+        # even when the consumer stops before the search is exhausted.
+        self.cover(c)
+        try:
+            r = c.down
+            while r != c:
+                solution.append(r)
+                j = r.right
+                while j != r:
+                    self.cover(j.column)
+                    j = j.right
+                try:
+                    yield from self._iter_search(solution)
+                finally:
+                    solution.pop()
+                    j = r.left
+                    while j != r:
+                        self.uncover(j.column)
+                        j = j.left
+                r = r.down
+        finally:
+            self.uncover(c)
+
+    # Engine-neutral primitives, used by drivers (e.g. stats.py) that walk the search
+    # tree themselves and work with either engine. Rows are identified by one of
+    # their nodes, and a column's row list ends when the walk returns to the column.
+
+    def column_name(self, col):
+        """
+        Return the name of a column.
+        """
+        return col.name
+
+    def column_size(self, col):
+        """
+        Return the number of rows currently in a column.
+        """
+        return col.size
+
+    def first_row(self, col):
+        """
+        Return the node of the first row in a column (the column itself if empty).
+        """
+        return col.down
+
+    def next_row(self, node):
+        """
+        Return the node of the next row in the same column.
+        """
+        return node.down
+
+    def row_length(self, node):
+        """
+        Return the number of columns in the row containing node.
+        """
+        length = 1
+        j = node.right
+        while j != node:
+            length += 1
+            j = j.right
+        return length
+
+    def row_columns(self, node):
+        """
+        Return the columns of node's row other than node's own column, in cover order.
+        """
+        columns = []
+        j = node.right
+        while j != node:
+            columns.append(j.column)
+            j = j.right
+        return columns
+
+    def cover_row(self, node):
+        """
+        Cover the columns of node's row other than node's own column.
+        """
+        j = node.right
+        while j != node:
+            self.cover(j.column)
+            j = j.right
+
+    def uncover_row(self, node):
+        """
+        Undo cover_row(node).
+        """
+        j = node.left
+        while j != node:
+            self.uncover(j.column)
+            j = j.left
+
+    def primary_columns(self):
+        """
+        Return the uncovered primary columns, in header order.
+        """
+        columns = []
+        j = self.header.right
+        while j is not self.header:
+            columns.append(j)
+            j = j.right
+        return columns
+
+    def row_items(self, index):
+        """
+        Return every column of row `index`, in row order.
+        """
+        node = self.rows[index]
+        return [node.column] + self.row_columns(node)
+
+    def row_of(self, node):
+        """
+        Return the row index of the row containing node.
+        """
+        return node.row_index
+
+
+# Available DLX engines, selectable by name: (module, class) of each engine.
+ENGINES = {
+    "linked": ("dancing_links", "DancingLinks"),
+    "array": ("array_dancing_links", "ArrayDancingLinks"),
+}
+
+
+def _engine_class(engine):
+    try:
+        module, name = ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Unknown DLX engine '{engine}'. Choose from: {', '.join(ENGINES)}") from None
+    return getattr(import_module(module), name)
+
+
+def create_dlx(columns, engine="linked"):
+    """
+    Create an empty DLX matrix using the requested engine.
+
+    Args:
+        columns (list): Tuples of (col_name, is_primary).
+        engine (str): "linked" for the Node/ColumnNode engine, or "array" for the
+            flat-array engine in array_dancing_links.py.
+
+    Returns:
+        DancingLinks | ArrayDancingLinks: The new matrix.
+    """
+    return _engine_class(engine)(columns)
+
+
+def create_dlx_sparse(columns, indptr, indices, row_data=None, engine="linked"):
+    """
+    Create a populated DLX matrix from integer column positions in CSR form.
+
+    This is the bulk construction path: see DancingLinks.from_sparse() for the
+    arguments. It avoids the per-cell name formatting and lookups of add_row().
+
+    Returns:
+        DancingLinks | ArrayDancingLinks: The new matrix.
+    """
+    return _engine_class(engine).from_sparse(columns, indptr, indices, row_data)
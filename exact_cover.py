@@ -0,0 +1,246 @@
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import closing
+from dancing_links import ENGINES, create_dlx
+from heuristics import HEURISTICS, get_heuristic
+from memo import DEFAULT_CAPACITY, count_memo
+
+FORMATS = ("auto", "text", "jsonl")
+
+
+def _text_lines(lines):
+    """
+    Yield (line number, stripped line) for the meaningful lines of a text matrix.
+
+    Blank lines and lines starting with "|" (comments, as in Knuth's DLX programs)
+    are skipped.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if line and not line.startswith("|"):
+            yield number, line
+
+
+def _parse_columns_text(line, number):
+    """
+    Parse the column declaration line of a text matrix: primary column names, then
+    optionally "|" followed by the secondary column names.
+    """
+    primary, _, secondary = line.partition("|")
+    columns = [(name, True) for name in primary.split()]
+    columns.extend((name, False) for name in secondary.split())
+    if "|" in secondary:
+        raise ValueError(f"line {number}: only one '|' may separate primary from secondary columns")
+    if any(":" in name for name, _ in columns):
+        raise ValueError(f"line {number}: colored items ('name:color') are not supported")
+    return columns
+
+
+def _parse_columns_json(line, number):
+    """
+    Parse the column declaration line of a JSON-lines matrix:
+    {"primary": [...], "secondary": [...]}.
+    """
+    try:
+        header = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"line {number}: invalid JSON ({e.msg})") from None
+    if not isinstance(header, dict) or "primary" not in header:
+        raise ValueError(f"line {number}: expected a {{\"primary\": [...], \"secondary\": [...]}} header")
+    columns = [(str(name), True) for name in header["primary"]]
+    columns.extend((str(name), False) for name in header.get("secondary", ()))
+    return columns
+
+
+def _check_row(row, names, number):
+    """
+    Map a row's column names onto the declared (shared) name strings, rejecting
+    unknown and repeated columns.
+    """
+    try:
+        shared = tuple(names[name] for name in row)
+    except KeyError as e:
+        raise ValueError(f"line {number}: unknown column {e.args[0]!r}") from None
+    if len(set(shared)) != len(shared):
+        raise ValueError(f"line {number}: a column appears twice in the same row")
+    return shared
+
+
+def _text_rows(lines, names):
+    for number, line in lines:
+        row = _check_row(line.split(), names, number)
+        yield row, row
+
+
+def _json_rows(lines, names):
+    for number, line in lines:
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {number}: invalid JSON ({e.msg})") from None
+        if isinstance(entry, dict):
+            row = _check_row([str(name) for name in entry.get("columns", ())], names, number)
+            yield row, entry.get("data", row)
+        else:
+            row = _check_row([str(name) for name in entry], names, number)
+            yield row, row
+
+
+def read_matrix(lines, fmt="auto"):
+    """
+    Parse an exact-cover matrix from an iterable of lines, lazily.
+
+    Two formats are understood:
+      text:  the first line lists the primary column names, optionally followed by
+             "|" and the secondary column names; every further line is one row, as
+             whitespace-separated column names. Lines starting with "|" are comments.
+      jsonl: the first line is {"primary": [...], "secondary": [...]}; every further
+             line is one row, either a list of column names or
+             {"columns": [...], "data": <any JSON value>}.
+    With fmt="auto", a first line starting with "{" selects jsonl.
+
+    Args:
+        lines (iterable[str]): Source lines, e.g. an open file.
+        fmt (str): "auto", "text" or "jsonl".
+
+    Returns:
+        tuple: (columns, rows)
+            columns: list of (name, is_primary) tuples, as taken by create_dlx().
+            rows: generator of (row, row_data) pairs, as taken by add_rows(); it
+                parses one line at a time. Without explicit data, row_data is the
+                row's tuple of column names.
+
+    Raises:
+        ValueError: On a malformed header or row (reported with its line number, when
+            the rows are consumed).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown matrix format '{fmt}'. Choose from: {', '.join(FORMATS)}")
+    meaningful = _text_lines(lines)
+    try:
+        number, header = next(meaningful)
+    except StopIteration:
+        raise ValueError("empty matrix: no column declaration found") from None
+    if fmt == "auto":
+        fmt = "jsonl" if header.startswith("{") else "text"
+
+    if fmt == "jsonl":
+        columns = _parse_columns_json(header, number)
+    else:
+        columns = _parse_columns_text(header, number)
+    names = {}
+    for name, _ in columns:
+        if name in names:
+            raise ValueError(f"line {number}: column {name!r} is declared twice")
+        names[name] = name
+
+    rows = _json_rows(meaningful, names) if fmt == "jsonl" else _text_rows(meaningful, names)
+    return columns, rows
+
+
+def load_matrix(path, engine="linked", fmt="auto"):
+    """
+    Build a DLX matrix from a matrix file, streaming its rows straight into the engine.
+
+    Args:
+        path (str): Matrix file, or "-" for standard input.
+        engine (str): DLX engine to use, "linked" (default) or "array".
+        fmt (str): "auto", "text" or "jsonl"; see read_matrix().
+
+    Returns:
+        DancingLinks | ArrayDancingLinks: The populated matrix.
+    """
+    if path == "-":
+        columns, rows = read_matrix(sys.stdin, fmt)
+        dlx = create_dlx(columns, engine)
+        dlx.add_rows(rows)
+        return dlx
+    with open(path) as f:
+        columns, rows = read_matrix(f, fmt)
+        dlx = create_dlx(columns, engine)
+        dlx.add_rows(rows)
+    return dlx
+
+
+def format_solution(solution):
+    """
+    Return a solution as text: one line per chosen row, in the order it was chosen.
+    """
+    return "\n".join(
+        " ".join(map(str, data)) if isinstance(data, (tuple, list)) else json.dumps(data)
+        for data in solution
+    )
+
+
+def main(argv=None):
+    """
+    Command-line entrypoint: count or enumerate the solutions of any exact-cover matrix.
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve an exact-cover problem (Sudoku, pentominoes, ...) with Dancing Links."
+    )
+    parser.add_argument("matrix", help="matrix file in text or JSON-lines format, or '-' for stdin")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--count", action="store_true", help="only count the solutions")
+    mode.add_argument("--all", action="store_true", help="print every solution")
+    mode.add_argument("--limit", type=int, default=None,
+                      help="print at most this many solutions (default: 1)")
+    parser.add_argument("--engine", choices=list(ENGINES), default="linked",
+                        help="DLX engine (default: linked)")
+    parser.add_argument("--format", choices=FORMATS, default="auto",
+                        help="matrix file format (default: auto)")
+    parser.add_argument("--heuristic", choices=HEURISTICS, default="mrv",
+                        help="column choice strategy (default: mrv)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="random seed for --heuristic mrv-random")
+    parser.add_argument("--memo", action="store_true",
+                        help="with --count, reuse the counts of repeated subproblems and report the hit rate")
+    parser.add_argument("--memo-size", type=int, default=DEFAULT_CAPACITY,
+                        help=f"with --memo, most subproblem counts kept (default: {DEFAULT_CAPACITY})")
+    args = parser.parse_args(argv)
+    if args.memo and not args.count:
+        parser.error("--memo requires --count")
+    if args.memo_size < 1:
+        parser.error("--memo-size must be at least 1")
+
+    label = "stdin" if args.matrix == "-" else os.path.basename(args.matrix)
+    start = time.time()
+    try:
+        dlx = load_matrix(args.matrix, args.engine, args.format)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    build_time = time.time() - start
+    dlx.set_heuristic(get_heuristic(args.heuristic, args.seed))
+    print(f"[{label}] Loaded {len(dlx.row_data)} rows and {len(dlx.columns)} columns "
+          f"in {build_time:.4f} seconds.")
+
+    start = time.time()
+    if args.count and args.memo:
+        count, stats = count_memo(dlx, args.memo_size)
+        elapsed = time.time() - start
+        print(f"[{label}] Counted {count} solutions in {elapsed:.4f} seconds "
+              f"(memo hit rate {stats.hit_rate:.1%}: {stats.hits} hits, {stats.misses} misses, "
+              f"{stats.evictions} evictions).")
+        return
+    if args.count:
+        count = dlx.count()
+        elapsed = time.time() - start
+        print(f"[{label}] Counted {count} solutions in {elapsed:.4f} seconds.")
+        return
+
+    limit = None if args.all else (args.limit if args.limit is not None else 1)
+    found = 0
+    with closing(dlx.iter_solutions(limit)) as solutions:
+        for solution in solutions:
+            found += 1
+            print(f"\nSolution {found}:")
+            print(format_solution(solution))
+    elapsed = time.time() - start
+    print(f"\n[{label}] Solved in {elapsed:.4f} seconds with {found} solutions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import random
+import time
+from solutions import SolutionSet, to_permutation
+
+RESTART_POLICIES = ("luby", "geometric")
+
+
+def luby(i):
+    """
+    Return the i-th term (1-based) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, ...
+
+    Scaling a restart budget by this sequence is within a log factor of the best
+    fixed budget for any runtime distribution (Luby, Sinclair and Zuckerman, 1993).
+    """
+    while True:
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        if (1 << k) - 1 == i:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+def _budgets(restarts, base_budget):
+    """
+    Yield the node budget of each attempt: unbounded without restarts.
+    """
+    if restarts is None:
+        yield None
+        return
+    attempt = 1
+    budget = float(base_budget)
+    while True:
+        if restarts == "luby":
+            yield base_budget * luby(attempt)
+        else:
+            yield int(budget)
+            budget *= 1.5
+        attempt += 1
+
+
+def _attempt(dlx, rng, budget):
+    """
+    Run one depth-first search that stops at the first solution or after `budget` nodes.
+
+    The search is iterative, so it reaches depth 1000 and beyond; with an rng, the
+    rows of each chosen column are tried in a random order. The matrix is restored
+    however the attempt ends.
+
+    Returns:
+        tuple: (solution, nodes, exhausted)
+            solution: tuple of row_data, or None.
+            nodes: int, search-tree nodes visited.
+            exhausted: bool, True if the whole tree was searched without a solution.
+    """
+    stack = []  # [column, candidate rows, position of the current row] per level
+    nodes = 0
+    try:
+        while True:
+            if budget is not None and nodes >= budget:
+                return None, nodes, False
+            nodes += 1
+            c = dlx.choose_column()
+            if not c:
+                solution = tuple(dlx.row_data[dlx.row_of(rows[pos])] for _, rows, pos in stack)
+                return solution, nodes, False
+            if dlx.column_size(c):
+                dlx.cover(c)
+                rows = []
+                r = dlx.first_row(c)
+                while r != c:
+                    rows.append(r)
+                    r = dlx.next_row(r)
+                if rng is not None:
+                    rng.shuffle(rows)
+                dlx.cover_row(rows[0])
+                stack.append([c, rows, 0])
+                continue
+
+            # Dead end: backtrack to the deepest level that still has an untried row.
+            while stack:
+                level = stack[-1]
+                c, rows, pos = level
+                dlx.uncover_row(rows[pos])
+                pos += 1
+                if pos < len(rows):
+                    level[2] = pos
+                    dlx.cover_row(rows[pos])
+                    break
+                dlx.uncover(c)
+                stack.pop()
+            else:
+                return None, nodes, True
+    finally:
+        while stack:
+            c, rows, pos = stack.pop()
+            dlx.uncover_row(rows[pos])
+            dlx.uncover(c)
+
+
+def find_one(dlx, randomize=False, seed=None, restarts="luby", base_budget=None):
+    """
+    Search a DLX matrix (either engine) for a single solution and stop there.
+
+    Without randomization this is the first solution in the usual search order. With
+    it, the rows of every chosen column are tried in random order, and the search is
+    restarted with a fresh random order whenever an attempt exceeds its node budget.
+    This avoids the heavy-tailed runtimes of unlucky early choices on large n-Queens
+    boards, where solutions are plentiful but one bad branch can take forever.
+
+    Args:
+        dlx (DancingLinks | ArrayDancingLinks): Matrix to search; left unchanged.
+        randomize (bool): Try rows in random order, with restarts.
+        seed (int | None): Seed for the random order, for reproducible runs.
+        restarts (str | None): With randomize, "luby" (default) or "geometric" growth
+            of the per-attempt node budget, or None for a single unbounded attempt.
+        base_budget (int | None): Node budget unit; defaults to twice the number of
+            primary columns, about four times the depth of an n-Queens solution.
+
+    Returns:
+        tuple: (solution, attempts, nodes)
+            solution: tuple of row_data, or None if the matrix has no solution.
+            attempts: int, number of attempts (restarts + 1).
+            nodes: int, search-tree nodes visited over all attempts.
+
+    Raises:
+        ValueError: For an unknown restart policy.
+    """
+    if restarts is not None and restarts not in RESTART_POLICIES:
+        raise ValueError(f"Unknown restart policy '{restarts}'. Choose from: {', '.join(RESTART_POLICIES)}")
+    rng = random.Random(seed) if randomize else None
+    if not randomize:
+        restarts = None  # A restart would repeat the same deterministic search
+    if base_budget is None:
+        base_budget = max(2 * len(dlx.primary_columns()), 1)
+
+    attempts = 0
+    total_nodes = 0
+    for budget in _budgets(restarts, base_budget):
+        attempts += 1
+        solution, nodes, exhausted = _attempt(dlx, rng, budget)
+        total_nodes += nodes
+        if solution is not None or exhausted:
+            return solution, attempts, total_nodes
+    return None, attempts, total_nodes  # Not reached: budgets never run out
+
+
+def solve_first(build, n, label, engine="linked", seed=None, restarts="luby", heuristic=None):
+    """
+    Find one n-Queens solution with randomized restarts, for boards too large to enumerate.
+
+    Args:
+        build (callable): Matrix builder such as nqueens.build_n_queens.
+        n (int): Board size.
+        label (str): Name used in the progress message, e.g. "Original".
+        engine (str): DLX engine to use, "linked" (default) or "array".
+        seed (int | None): Seed for the random row order.
+        restarts (str | None): Restart policy, see find_one().
+        heuristic (callable | None): Column choice strategy (see heuristics.py).
+
+    Returns:
+        tuple: (results, elapsed)
+            results: SolutionSet holding the solution found (empty if there is none).
+            elapsed: float, time taken in seconds.
+    """
+    start = time.time()
+    dlx = build(n, engine)
+    dlx.set_heuristic(heuristic)
+    build_time = time.time() - start
+
+    solution, attempts, nodes = find_one(dlx, randomize=True, seed=seed, restarts=restarts)
+    results = SolutionSet(n, [to_permutation(solution, n)] if solution is not None else [])
+
+    elapsed = time.time() - start
+    print(f"[{label}] Found {len(results)} solution for {n}-Queens in {elapsed:.4f} seconds "
+          f"after {attempts} attempt(s) and {nodes} nodes (build {build_time:.4f} s).")
+
+    return results, elapsed
@@ -1,39 +1,129 @@
+import queue
+import threading
 import tkinter as tk
 import sys
-from organpipe import solve_nq_organ
+import time
+from organpipe import build_nq_organ
+from first_solution import find_one
+from preassign import count_completions, find_completion
+from search_driver import SearchDriver
+from search_trace import CHOOSE, BACKTRACK, SearchTrace
+from solutions import SolutionSet, positions, to_permutation
+from solution_cache import SolutionCache
 
 # Constants for board rendering and colors
 CELL_SIZE = 60  # Size (in pixels) of each cell on the chessboard
+MAX_BOARD_PIXELS = 900  # Larger boards shrink their cells to fit in this size
+MIN_CELL_SIZE = 2  # Smallest cell size, for boards with hundreds of rows
+IMAGE_BOARD_MIN_N = 100  # From this size the squares are one tiled image, not n x n canvas items
+ENUMERATE_MAX_N = 30  # Above this size only one solution is searched for (see --first)
 BOARD_COLOR_1 = "#EEEED2"  # Light-colored square
 BOARD_COLOR_2 = "#769656"  # Dark-colored square
 HIGHLIGHT_COLOR = "#FFD700"  # Color for highlighting threatened squares
 QUEEN_COLOR = "black"  # Color to draw the queen symbol
 ERROR_COLOR = "red"  # Color for drawing conflict markers
+COMPLETION_COLOR = "#4169E1"  # Color for the other queens of a completion of the temporary queen
+COMPLETION_MAX_N = 30  # Above this size double-click only shows pairwise conflicts
+COUNT_COMPLETIONS_MAX_N = 10  # Above this size completions are found but not counted
 
 ANIMATION_DELAY = 200  # Delay in milliseconds between animation steps
+POLL_INTERVAL = 100  # Delay in milliseconds between checks for new solutions
+SOLVER_SLICE = 2000  # Search-tree nodes the solver thread visits between progress reports
+TRACE_FRAME_INTERVAL = 50  # Delay in milliseconds between frames of the search trace (20 fps)
+TRACE_MAX_NODES_PER_FRAME = 1000  # Fastest setting of the trace speed slider
+
+
+class SolverThread(threading.Thread):
+    """
+    Runs the organ-pipe DLX search in the background and streams its results.
+
+    The search advances in slices of SOLVER_SLICE nodes through SearchDriver, so it
+    checks for cancellation regularly even when solutions are far apart. After each
+    slice, a message (kind, solutions, nodes) is put on the `results` queue:
+    kind is "progress", "done" or "cancelled"; solutions are the permutations found
+    in that slice, and nodes is the running number of search-tree nodes. Once the
+    search ends, `elapsed` holds its wall-clock time in seconds.
+    """
+
+    def __init__(self, n, first=False):
+        """
+        Args:
+            n (int): Board size.
+            first (bool): Only look for one solution, with randomized restarts.
+        """
+        super().__init__(daemon=True)  # Never keeps the app alive once the window closes
+        self.n = n
+        self.first = first
+        self.results = queue.Queue()
+        self.cancelled = threading.Event()
+        self.elapsed = 0.0
+
+    def cancel(self):
+        """
+        Ask the search to stop after its current slice.
+        """
+        self.cancelled.set()
+
+    def run(self):
+        start = time.time()
+        dlx = build_nq_organ(self.n, "array" if self.first else "linked")
+        if self.first:
+            # One attempt sequence with no slices: cancellation takes effect once it returns.
+            solution, _, nodes = find_one(dlx, randomize=True)
+            found = [to_permutation(solution, self.n)] if solution is not None else []
+            self.elapsed = time.time() - start
+            self.results.put(("done", found, nodes))
+            return
+        driver = SearchDriver(dlx)
+        while not driver.finished:
+            if self.cancelled.is_set():
+                driver.abort()
+                self.results.put(("cancelled", [], driver.nodes))
+                return
+            found = driver.step(SOLVER_SLICE)
+            self.results.put(("progress", [to_permutation(s, self.n) for s in found], driver.nodes))
+        self.elapsed = time.time() - start
+        self.results.put(("done", [], driver.nodes))
 
 
 class NQueensGUI:
-    def __init__(self, root, n, solutions):
+    def __init__(self, root, n, solutions, solver=None, on_done=None):
         """
         Initialize the n-Queens GUI.
 
         Args:
             root (tk.Tk): The main Tkinter window.
             n (int): Board size (number of rows/columns).
-            solutions (list): List of solution node lists from DLX solver.
+            solutions (list): Solutions from the DLX solver, each a permutation (column per row).
+                With a solver, this is the (usually empty) SolutionSet that receives them.
+            solver (SolverThread | None): Running background search to stream solutions from.
+            on_done (callable | None): Called with the solutions once the solver completes.
         """
         self.root = root  # Store reference to the main window
         self.n = n  # Store board size
-        self.solutions = solutions  # Store all found solutions
+        self.solutions = solutions  # Store all found solutions (so far, while solving)
+        self.solver = solver  # Background search, if solutions are still arriving
+        self.on_done = on_done
         self.current_index = 0  # Index of the currently displayed solution
         self.selected_queen = None  # Coordinates of a selected queen (for threat checking)
         self.temp_queen = None  # Coordinates of a temporarily placed queen by user
         self.conflict_pair = None  # Pairs of coordinates in conflict
+        self.completion = None  # Queens of a full solution containing the temporary queen
+        self.query_status = None  # Outcome of the last completion query
+        self.query_dlx = None  # Matrix for completion queries, built on first use
         self.animating = False  # Flag to indicate if animation is running
+        self.tracing = False  # Flag to indicate if the animation is a live search trace
+        if n < 1:
+            # No board to lay out: report the bad size in the status line instead
+            self.status = tk.Label(root, anchor="w", text=f"Board size must be at least 1, got {n}")
+            self.status.pack(fill=tk.X)
+            return
+        # Shrink the cells of large boards so the whole board fits on screen
+        self.cell_size = max(MIN_CELL_SIZE, min(CELL_SIZE, MAX_BOARD_PIXELS // n))
+        self.font_size = max(1, self.cell_size // 2)
 
         # Create and pack the drawing canvas
-        self.canvas = tk.Canvas(root, width=n * CELL_SIZE, height=n * CELL_SIZE)
+        self.canvas = tk.Canvas(root, width=n * self.cell_size, height=n * self.cell_size)
         self.canvas.pack()
 
         # Create a frame for control buttons
@@ -52,85 +142,260 @@ class NQueensGUI:
         self.animate_btn = tk.Button(btn_frame, text="▶ Animate Solution", command=self.start_animation)
         self.animate_btn.grid(row=0, column=2)
 
+        # Button to stop the background search, keeping the solutions found so far
+        self.cancel_btn = tk.Button(btn_frame, text="■ Cancel", command=self.cancel_solver,
+                                    state=tk.NORMAL if solver else tk.DISABLED)
+        self.cancel_btn.grid(row=0, column=3)
+
+        # Button to animate the actual DLX search, backtracking included (toggles)
+        self.trace_btn = tk.Button(btn_frame, text="▶ Trace Search", command=self.toggle_trace)
+        self.trace_btn.grid(row=0, column=4)
+
+        # Search-tree nodes advanced per trace frame; intermediate states are skipped
+        self.trace_speed = tk.Scale(btn_frame, from_=1, to=TRACE_MAX_NODES_PER_FRAME, orient=tk.HORIZONTAL,
+                                    label="Nodes/frame")
+        self.trace_speed.grid(row=0, column=5)
+
+        # Progress line: current solution index, solutions found and search status
+        self.status = tk.Label(root, anchor="w")
+        self.status.pack(fill=tk.X)
+        self.search_status = "Searching..." if solver else "Done"
+
         # Bind mouse click for selecting queens
         self.canvas.bind("<Button-1>", self.on_click)
         # Bind double-click for placing a temporary queen
         self.canvas.bind("<Double-1>", self.on_double_click)
 
-        # Initialize positions from the first solution in list
-        self.positions = [(node.row_data[0], node.row_data[1]) for node in self.solutions[self.current_index]]
-        self.draw_board()  # Draw the initial board and queens
+        # Initialize positions from the first solution in list (an empty board until one arrives)
+        self.positions = positions(self.solutions[self.current_index]) if self.solutions else []
+        self.create_board()  # Create the persistent square items
+        self.draw_board()  # Draw the initial queens
+        self.update_status()
+
+        # Poll the background search for new solutions
+        if solver:
+            root.protocol("WM_DELETE_WINDOW", self.close)
+            self.root.after(POLL_INTERVAL, self.poll_solver)
+
+    def poll_solver(self):
+        """
+        Move newly found solutions from the solver's queue into the solution list.
+        """
+        had_solutions = bool(self.solutions)
+        finished = None
+        nodes = 0
+        while True:
+            try:
+                kind, found, nodes = self.solver.results.get_nowait()
+            except queue.Empty:
+                break
+            self.solutions.extend(found)
+            if kind != "progress":
+                finished = kind
+
+        if finished == "done":
+            self.search_status = f"Done ({nodes} nodes searched)"
+        elif finished == "cancelled":
+            self.search_status = f"Cancelled after {nodes} nodes"
+        elif nodes:
+            self.search_status = f"Searching... ({nodes} nodes)"
+
+        if finished is not None:
+            self.solver = None
+            self.cancel_btn.config(state=tk.DISABLED)
+
+        # Show the first solution as soon as it arrives
+        if self.solutions and not had_solutions and not self.animating:
+            self.positions = positions(self.solutions[0])
+            self.draw_board()
+        self.update_status()
+
+        if finished is None:
+            self.root.after(POLL_INTERVAL, self.poll_solver)
+        elif finished == "done" and self.on_done:
+            self.on_done(self.solutions)
+
+    def cancel_solver(self):
+        """
+        Stop the background search; the solutions found so far stay navigable.
+        """
+        if self.solver:
+            self.solver.cancel()
+            self.search_status = "Cancelling..."
+            self.update_status()
+
+    def close(self):
+        """
+        Cancel any running search, then close the window.
+        """
+        if self.solver:
+            self.solver.cancel()
+        self.root.destroy()
+
+    def update_status(self):
+        """
+        Refresh the progress line below the buttons.
+        """
+        if self.tracing:
+            shown = self.trace_status
+        elif self.solutions:
+            shown = f"Solution {self.current_index + 1} of {len(self.solutions)}"
+        else:
+            shown = "No solutions yet" if self.solver else "No solutions"
+        if self.query_status:
+            shown += f" | {self.query_status}"
+        self.status.config(text=f"{shown} | {self.search_status}")
+
+    def create_board(self):
+        """
+        Create the n x n square items once; later updates only change their colors.
+
+        Large boards would need n^2 canvas items, so from IMAGE_BOARD_MIN_N on the
+        checkerboard is a single image, tiled from one 2 x 2 block of squares, and
+        only highlighted squares get their own items.
+        """
+        size = self.cell_size
+        self.squares = None  # Canvas item ID of each square, indexed [row][column] (None on an image board)
+        self.overlays = {}  # On an image board: highlight item of each colored square
+        if self.n >= IMAGE_BOARD_MIN_N:
+            block = [[BOARD_COLOR_1] * size + [BOARD_COLOR_2] * size] * size
+            block += [[BOARD_COLOR_2] * size + [BOARD_COLOR_1] * size] * size
+            self.board_image = tk.PhotoImage(width=self.n * size, height=self.n * size)
+            self.board_image.put(" ".join("{" + " ".join(row) + "}" for row in block),
+                                 to=(0, 0, self.n * size, self.n * size))
+            self.board_item = self.canvas.create_image(0, 0, image=self.board_image, anchor="nw")
+        else:
+            self.squares = []
+            for i in range(self.n):
+                row = []
+                for j in range(self.n):
+                    # Choose base color based on checker pattern
+                    row.append(self.canvas.create_rectangle(
+                        j * size, i * size, (j + 1) * size, (i + 1) * size,
+                        fill=self.base_color(i, j), outline="black"
+                    ))
+                self.squares.append(row)
+        self.queen_items = {}  # Canvas item ID of each drawn queen, by (row, col)
+        self.highlighted = set()  # Squares currently drawn in HIGHLIGHT_COLOR
+        self.highlight_source = None  # Queen the highlighted squares belong to
+        self.drawn_markers = None  # (temp_queen, conflicts) as last drawn
+
+    def paint_square(self, i, j, color=None):
+        """
+        Fill square (i, j) with a color, or restore its board color when color is None.
+        """
+        if self.squares is not None:
+            self.canvas.itemconfig(self.squares[i][j], fill=color or self.base_color(i, j))
+        elif color is None:
+            self.canvas.delete(self.overlays.pop((i, j)))
+        elif (i, j) in self.overlays:
+            self.canvas.itemconfig(self.overlays[(i, j)], fill=color)
+        else:
+            size = self.cell_size
+            item = self.canvas.create_rectangle(j * size, i * size, (j + 1) * size, (i + 1) * size,
+                                                fill=color, outline="")
+            self.canvas.tag_raise(item, self.board_item)  # Just above the board, below the queens
+            self.overlays[(i, j)] = item
+
+    def base_color(self, i, j):
+        return BOARD_COLOR_1 if (i + j) % 2 == 0 else BOARD_COLOR_2
+
+    def center(self, r, c):
+        """
+        Return the canvas coordinates of the center of square (r, c).
+        """
+        return c * self.cell_size + self.cell_size // 2, r * self.cell_size + self.cell_size // 2
+
+    def threatened_squares(self, queen):
+        """
+        Return every square a queen attacks (its row, column and diagonals), itself included.
+        """
+        r, c = queen
+        n = self.n
+        squares = {(r, j) for j in range(n)} | {(i, c) for i in range(n)}
+        for i in range(n):
+            for j in (c + (i - r), c - (i - r)):
+                if 0 <= j < n:
+                    squares.add((i, j))
+        return squares
 
     def draw_board(self):
         """
-        Render the chessboard, queens, highlights, and any temporary markers.
-        """
-        self.canvas.delete("all")  # Clear existing drawings
-        # Draw board squares
-        for i in range(self.n):
-            for j in range(self.n):
-                # Choose base color based on checker pattern
-                base_color = BOARD_COLOR_1 if (i + j) % 2 == 0 else BOARD_COLOR_2
-                # Highlight if selected queen threatens this square
-                if self.selected_queen and self.threatens(self.selected_queen, (i, j)):
-                    fill = HIGHLIGHT_COLOR
-                else:
-                    fill = base_color
-
-                # Draw the square rectangle
-                self.canvas.create_rectangle(
-                    j * CELL_SIZE, i * CELL_SIZE,
-                    (j + 1) * CELL_SIZE, (i + 1) * CELL_SIZE,
-                    fill=fill, outline="black"
-                )
-
-        # Draw the actual queens for current solution
-        for r, c in self.positions:
-            x = c * CELL_SIZE + CELL_SIZE // 2  # Center x-coordinate
-            y = r * CELL_SIZE + CELL_SIZE // 2  # Center y-coordinate
-            self.canvas.create_text(x, y, text="♛", font=("Arial", 30), fill=QUEEN_COLOR)
-
-        # Draw a temporary queen if user placed one
-        if self.temp_queen:
-            r, c = self.temp_queen
-            x = c * CELL_SIZE + CELL_SIZE // 2
-            y = r * CELL_SIZE + CELL_SIZE // 2
-            self.canvas.create_text(x, y, text="♛", font=("Arial", 30), fill="blue")
-
-        # Draw conflict markers if any conflicts detected
-        if self.conflict_pair:
-            for r, c in self.conflict_pair:
-                x = c * CELL_SIZE + CELL_SIZE // 2
-                y = r * CELL_SIZE + CELL_SIZE // 2
-                self.canvas.create_text(x, y, text="❌", font=("Arial", 30), fill=ERROR_COLOR)
+        Bring the canvas in line with the current queens, highlights and markers.
+
+        The squares and queens are persistent canvas items, so only the items whose
+        state changed are touched; the threat highlight is computed once per selection.
+        """
+        # Highlight the squares threatened by the selected queen
+        if self.selected_queen != self.highlight_source:
+            wanted = self.threatened_squares(self.selected_queen) if self.selected_queen else set()
+            for i, j in self.highlighted - wanted:
+                self.paint_square(i, j)
+            for i, j in wanted - self.highlighted:
+                self.paint_square(i, j, HIGHLIGHT_COLOR)
+            self.highlighted = wanted
+            self.highlight_source = self.selected_queen
+
+        # Move the queens: remove the ones no longer placed, add the new ones
+        wanted = set(self.positions)
+        for square in set(self.queen_items) - wanted:
+            self.canvas.delete(self.queen_items.pop(square))
+        for r, c in wanted - set(self.queen_items):
+            x, y = self.center(r, c)
+            self.queen_items[(r, c)] = self.canvas.create_text(
+                x, y, text="♛", font=("Arial", self.font_size), fill=QUEEN_COLOR)
+
+        # Redraw the temporary queen and conflict markers only when they change
+        markers = (self.temp_queen, tuple(self.conflict_pair or ()), tuple(self.completion or ()))
+        if markers != self.drawn_markers:
+            self.canvas.delete("marker")
+            # Draw a temporary queen if user placed one
+            if self.temp_queen:
+                x, y = self.center(*self.temp_queen)
+                self.canvas.create_text(x, y, text="♛", font=("Arial", self.font_size), fill="blue",
+                                        tags="marker")
+            # Draw the rest of a completion, except where a real queen already stands
+            for r, c in self.completion or ():
+                if (r, c) != self.temp_queen and (r, c) not in self.queen_items:
+                    x, y = self.center(r, c)
+                    self.canvas.create_text(x, y, text="♕", font=("Arial", self.font_size),
+                                            fill=COMPLETION_COLOR, tags="marker")
+            # Draw conflict markers if any conflicts detected
+            for r, c in self.conflict_pair or ():
+                x, y = self.center(r, c)
+                self.canvas.create_text(x, y, text="❌", font=("Arial", self.font_size), fill=ERROR_COLOR,
+                                        tags="marker")
+            self.drawn_markers = markers
 
     def show_next(self):
         """
         Advance to the next solution, wrapping around if at end.
         """
-        # Do nothing if animation is in progress
-        if self.animating:
+        # Do nothing if animation is in progress or nothing has been found yet
+        if self.animating or not self.solutions:
             return
-        # Move index forward and wrap
+        # Move index forward and wrap (over the solutions received so far)
         self.current_index = (self.current_index + 1) % len(self.solutions)
         self.reset_temp()  # Clear any temporary markers
         # Update positions for the new solution
-        self.positions = [(node.row_data[0], node.row_data[1]) for node in self.solutions[self.current_index]]
+        self.positions = positions(self.solutions[self.current_index])
         self.draw_board()  # Redraw board
+        self.update_status()
 
     def show_prev(self):
         """
         Go to the previous solution, wrapping around if at start.
         """
-        # Do nothing if animation is in progress
-        if self.animating:
+        # Do nothing if animation is in progress or nothing has been found yet
+        if self.animating or not self.solutions:
             return
-        # Move index forward and wrap
+        # Move index backward and wrap (over the solutions received so far)
         self.current_index = (self.current_index - 1) % len(self.solutions)
         self.reset_temp()  # Clear any temporary markers
         # Update positions for the new solution
-        self.positions = [(node.row_data[0], node.row_data[1]) for node in self.solutions[self.current_index]]
+        self.positions = positions(self.solutions[self.current_index])
         self.draw_board()  # Redraw board
+        self.update_status()
 
     def reset_temp(self):
         """
@@ -139,6 +404,8 @@ class NQueensGUI:
         self.selected_queen = None
         self.temp_queen = None
         self.conflict_pair = None
+        self.completion = None
+        self.query_status = None
 
     def on_click(self, event):
         """
@@ -147,8 +414,8 @@ class NQueensGUI:
         # Do nothing if animation is in progress
         if self.animating:
             return
-        col = event.x // CELL_SIZE  # Compute board column from x-coordinate
-        row = event.y // CELL_SIZE  # Compute board row from y-coordinate
+        col = event.x // self.cell_size  # Compute board column from x-coordinate
+        row = event.y // self.cell_size  # Compute board row from y-coordinate
 
         # Toggle selection if clicking on an existing queen
         if (row, col) in self.positions:
@@ -164,8 +431,11 @@ class NQueensGUI:
         # Do nothing if animation is in progress
         if self.animating:
             return
-        col = event.x // CELL_SIZE  # Compute board column from x-coordinate
-        row = event.y // CELL_SIZE  # Compute board row from y-coordinate
+        col = event.x // self.cell_size  # Compute board column from x-coordinate
+        row = event.y // self.cell_size  # Compute board row from y-coordinate
+        # Ignore clicks on the canvas border, just past the last row or column
+        if not (0 <= row < self.n and 0 <= col < self.n):
+            return
         self.temp_queen = (row, col)  # Place temp queen at clicked cell
         self.conflict_pair = []  # Prepare list for any conflicts
 
@@ -177,7 +447,36 @@ class NQueensGUI:
                 self.conflict_pair.append((real_r, real_c))
 
         self.conflict_pair = list(set(self.conflict_pair))  # Remove duplicates
-        self.draw_board()  # Show conflict markers
+        self.query_completion()  # Look for full solutions through the temp queen
+        self.draw_board()  # Show conflict markers and the completion
+        self.update_status()
+
+    def query_completion(self):
+        """
+        Find a full solution containing the temporary queen, and count them on small boards.
+
+        The query matrix is built once and reused: each query forces the temp queen's
+        row, searches the reduced matrix and releases the row again.
+        """
+        self.completion = None
+        self.query_status = None
+        if self.n > COMPLETION_MAX_N:
+            return
+        if self.query_dlx is None:
+            self.query_dlx = build_nq_organ(self.n, "linked")
+            self.query_rows = {square: index for index, square in enumerate(self.query_dlx.row_data)}
+        r, c = self.temp_queen
+        rows = [self.query_rows[(r, c)]]
+        solution = find_completion(self.query_dlx, rows)
+        if solution is None:
+            self.query_status = f"No solution with a queen at ({r}, {c})"
+            return
+        self.completion = solution
+        if self.n <= COUNT_COMPLETIONS_MAX_N:
+            count = count_completions(self.query_dlx, rows)
+            self.query_status = f"{count} solution(s) with a queen at ({r}, {c})"
+        else:
+            self.query_status = f"Solvable with a queen at ({r}, {c})"
 
     def threatens(self, q1, q2):
         """
@@ -202,13 +501,13 @@ class NQueensGUI:
         """
         Begin animating the placement of queens in sequence.
         """
-        # Do nothing if animation is in progress
-        if self.animating:
+        # Do nothing if animation is in progress or there is no solution to animate
+        if self.animating or not self.solutions:
             return
         self.animating = True
         self.positions = []  # Clear positions to animate from empty board
         # Extract steps from the current solution
-        self.solution_steps = [(node.row_data[0], node.row_data[1]) for node in self.solutions[self.current_index]]
+        self.solution_steps = positions(self.solutions[self.current_index])
         self.step_index = 0  # Start at first queen
         self.animate_step()  # Kick off recursive animation
 
@@ -227,26 +526,113 @@ class NQueensGUI:
         else:
             self.animating = False  # The animation is complete
 
+    def toggle_trace(self):
+        """
+        Start animating the real search from an empty board, or stop a running trace.
+        """
+        if self.tracing:
+            self.stop_trace()
+            # Back to the solution shown before the trace
+            self.positions = positions(self.solutions[self.current_index]) if self.solutions else []
+            self.draw_board()
+            self.update_status()
+            return
+        if self.animating:
+            return
+        self.reset_temp()  # Clear any temporary markers
+        self.animating = True
+        self.tracing = True
+        self.trace = SearchTrace()
+        self.trace_driver = SearchDriver(build_nq_organ(self.n, "linked"), trace=self.trace)
+        self.trace_rows = {}  # Square chosen at each depth of the partial solution
+        self.backtracks = 0
+        self.trace_status = "Tracing..."
+        self.trace_btn.config(text="■ Stop Trace")
+        self.trace_frame()
+
+    def trace_frame(self):
+        """
+        Advance the traced search by one frame's worth of nodes and draw where it stands.
+
+        All the events of the frame are applied before drawing, so at higher speeds
+        the intermediate states are skipped. If the trace's ring buffer overflowed,
+        the board is resynchronized from the driver's stack instead.
+        """
+        if not self.tracing:
+            return
+        driver = self.trace_driver
+        found = driver.step(self.trace_speed.get())
+        dropped = self.trace.dropped
+        for kind, depth, square in self.trace.drain():
+            if kind == CHOOSE:
+                self.trace_rows[depth] = square
+            elif kind == BACKTRACK:
+                del self.trace_rows[depth]
+                self.backtracks += 1
+        if dropped:
+            dlx = driver.dlx
+            self.trace_rows = {depth: dlx.row_data[dlx.row_of(r)] for depth, (_, r) in enumerate(driver.stack)}
+
+        if found:
+            # Show the solution the search just reached rather than where it went next
+            self.trace_rows = dict(enumerate(found[0]))
+        self.positions = sorted(self.trace_rows.values())
+        self.trace_status = (f"Trace: depth {len(self.trace_rows)}, {driver.nodes} nodes, "
+                             f"{self.backtracks}{'+' if dropped else ''} backtracks")
+        self.draw_board()
+
+        if found or driver.finished:
+            self.stop_trace()
+            self.trace_status += " (solution found)" if found else " (no solution)"
+            # Keep the trace result on screen until the user navigates away
+            self.status.config(text=self.trace_status)
+            return
+        self.update_status()
+        self.root.after(TRACE_FRAME_INTERVAL, self.trace_frame)
+
+    def stop_trace(self):
+        """
+        End the trace and release the search's matrix.
+        """
+        self.trace_driver.abort()
+        self.tracing = False
+        self.animating = False
+        self.trace_btn.config(text="▶ Trace Search")
+
 
 def main():
     # Parse board size from command-line arguments
     try:
         n = int(sys.argv[1])
     except (IndexError, ValueError):
-        print("Usage: python3 gui.py <board_size>")
+        print("Usage: python3 gui.py <board_size> [--first]")
         sys.exit(1)
 
-    # Generate solutions via organ-pipe DLX solver
-    solutions, _ = solve_nq_organ(n)
-    if not solutions:
-        print(f"No solutions found for {n}-Queens.")
-        sys.exit(1)
+    # Reuse cached results when available; otherwise solve in the background and
+    # stream the solutions into the window as they are found
+    first = "--first" in sys.argv[2:] or n > ENUMERATE_MAX_N
+    cache = SolutionCache()
+    entry = None if first or n < 1 else cache.load("organ", n, "linked")
+    solutions = entry[0] if entry is not None else None
+    solver = None
+    if n < 1:
+        solutions = []  # The window only shows the error; there is nothing to solve
+    elif solutions is None:
+        solutions = SolutionSet(n)
+        solver = SolverThread(n, first=first)
+        solver.start()
+
+    def store(found):
+        # Only a complete enumeration is a valid cache entry
+        if not first:
+            cache.store("organ", n, "linked", found, solver.elapsed)
 
     # Initialize and run the Tkinter GUI
     root = tk.Tk()
     root.title(f"{n}-Queens Visualizer")
-    gui = NQueensGUI(root, n, solutions)
+    gui = NQueensGUI(root, n, solutions, solver=solver, on_done=store)
     root.mainloop()
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import random
+
+
+def mrv(dlx, columns):
+    """
+    Minimum remaining values: the column with the fewest rows, the first one on ties.
+
+    This is the engines' built-in choice; installing it explicitly only adds the cost
+    of listing the columns, so prefer heuristic=None for speed.
+    """
+    return min(columns, key=dlx.column_size)
+
+
+def mrv_random(seed=None):
+    """
+    Return an MRV heuristic that breaks ties uniformly at random.
+
+    Args:
+        seed (int | None): Seed for the private random generator, for reproducible runs.
+    """
+    rng = random.Random(seed)
+
+    def choose(dlx, columns):
+        size = dlx.column_size
+        smallest = min(size(c) for c in columns)
+        return rng.choice([c for c in columns if size(c) == smallest])
+
+    return choose
+
+
+def first_column(dlx, columns):
+    """
+    The first uncovered primary column, regardless of its size (no look-ahead).
+    """
+    return columns[0]
+
+
+# Built-in heuristics by name; "mrv" maps to None, the engines' fast built-in path.
+HEURISTICS = ("mrv", "mrv-random", "first")
+
+
+def get_heuristic(heuristic="mrv", seed=None):
+    """
+    Resolve a heuristic name (or callable) into what set_heuristic() expects.
+
+    Args:
+        heuristic (str | callable | None): "mrv", "mrv-random", "first", None (same
+            as "mrv"), or a callable(dlx, columns) returning one of `columns`.
+        seed (int | None): Seed for "mrv-random".
+
+    Returns:
+        callable | None: The strategy, or None for the built-in MRV.
+
+    Raises:
+        ValueError: For an unknown heuristic name.
+    """
+    if heuristic is None or heuristic == "mrv":
+        return None
+    if callable(heuristic):
+        return heuristic
+    if heuristic == "mrv-random":
+        return mrv_random(seed)
+    if heuristic == "first":
+        return first_column
+    raise ValueError(f"Unknown heuristic '{heuristic}'. Choose from: {', '.join(HEURISTICS)}")
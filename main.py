@@ -1,23 +1,374 @@
-import sys
-from nqueens import solve_n_queens, print_solution
-from organpipe import solve_nq_organ
+import argparse
+from functools import partial
+from nqueens import solve_n_queens, count_n_queens, print_solution
+from organpipe import solve_nq_organ, count_nq_organ
+from solution_cache import SolutionCache, cached_solve, cached_count
+from heuristics import HEURISTICS, get_heuristic
+from first_solution import RESTART_POLICIES, solve_first
+from memo import DEFAULT_CAPACITY, count_memoized
+from templates import LABELS, build_from_template, preload, template_builder
 
+# Modules only some options need (process pools, HTTP, JSON checkpoints, the
+# bitboard baseline, ...) are imported where they are used, so that the many short
+# runs that need none of them start faster.
 
-def main():
+# Larger boards are printed as their permutation instead of a full grid.
+MAX_PRINTED_BOARD = 40
+
+
+def parse_args(argv=None):
+    """
+    Parse the command-line options: board sizes plus optional solver settings.
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve n-Queens with Dancing Links in row-major and organ-pipe order."
+    )
+    parser.add_argument("sizes", nargs="*", help="board sizes to solve")
+    parser.add_argument("--engine", action="append", choices=["linked", "array", "bitboard"],
+                        help="DLX engine for both orderings (linked or array, default linked); "
+                             "'bitboard' adds a bitmask baseline to the summary. May be repeated.")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="stop each search after this many solutions")
+    parser.add_argument("--count-only", action="store_true",
+                        help="only count solutions, without storing or printing any")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="number of worker processes; above 1 the search tree is split across them "
+                             "(with --batch, the size of the shared pool instead)")
+    parser.add_argument("--depth", type=int, default=2,
+                        help="search-tree level at which --jobs splits the work (default: 2)")
+    parser.add_argument("--stats", action="store_true",
+                        help="also run an instrumented search and report nodes, updates and branching")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="bypass the on-disk solution cache")
+    parser.add_argument("--symmetry", action="store_true",
+                        help="search only half the board and expand solutions by symmetry")
+    parser.add_argument("--unique", action="store_true",
+                        help="with --symmetry, keep only the distinct (fundamental) solutions")
+    parser.add_argument("--checkpoint", metavar="BASE",
+                        help="with --count-only, periodically save the search position to "
+                             "BASE-<ordering>-n<N>.json")
+    parser.add_argument("--checkpoint-seconds", type=float, default=60.0,
+                        help="save a checkpoint at least this often (default: 60)")
+    parser.add_argument("--checkpoint-nodes", type=int, default=None,
+                        help="also save a checkpoint every this many search-tree nodes")
+    parser.add_argument("--resume", metavar="FILE",
+                        help="continue the count saved in a checkpoint file")
+    parser.add_argument("--heuristic", choices=HEURISTICS, default="mrv",
+                        help="column choice strategy: fewest rows first (mrv, default), mrv with "
+                             "random tie-breaking, or the first uncovered column")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="random seed for --heuristic mrv-random")
+    parser.add_argument("--ordering", metavar="SPEC",
+                        help="compare row-major order against a custom ordering instead of organ-pipe: "
+                             "PRIMARY[,SECONDARY[,ROWS]], each one of identity, organ, reverse, random, "
+                             "degree or diagonal (random uses --seed)")
+    parser.add_argument("--auto-tune", action="store_true",
+                        help="like --ordering, with the ordering that counts fastest on smaller boards")
+    parser.add_argument("--first", action="store_true",
+                        help="only find one solution per ordering, trying rows in random order with "
+                             "restarts (fast even for n in the hundreds; use --engine array there)")
+    parser.add_argument("--restarts", choices=RESTART_POLICIES, default="luby",
+                        help="with --first, how the node budget grows between restarts (default: luby)")
+    parser.add_argument("--memo", action="store_true",
+                        help="with --count-only, reuse the counts of repeated subproblems (memoized DLX) "
+                             "and report the memo hit rate")
+    parser.add_argument("--memo-size", type=int, default=DEFAULT_CAPACITY,
+                        help=f"with --memo, most subproblem counts kept, least recently used evicted "
+                             f"first (default: {DEFAULT_CAPACITY})")
+    parser.add_argument("--batch", action="store_true",
+                        help="run every size and both orderings concurrently on a shared pool of --jobs "
+                             "worker processes (default: CPU count), largest first, streaming results "
+                             "as they finish; results are not cached")
+    args = parser.parse_args(argv)
+    for size in args.sizes:
+        if size.lstrip("-").isdigit() and int(size) < 1:
+            parser.error(f"board size must be at least 1, got {size}")
+    if args.limit is not None and args.limit < 0:
+        parser.error("--limit cannot be negative")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.depth < 0:
+        parser.error("--depth cannot be negative")
+    if args.batch and (args.limit is not None or args.symmetry or args.stats or args.checkpoint or args.memo
+                       or args.auto_tune or args.heuristic != "mrv" or "bitboard" in (args.engine or [])):
+        parser.error("--batch cannot be combined with --limit, --symmetry, --stats, --checkpoint, --memo, "
+                     "--auto-tune, --heuristic or --engine bitboard")
+    # Under --batch, --jobs sizes the shared pool rather than splitting one search.
+    if args.first and (args.count_only or args.limit is not None or (args.jobs > 1 and not args.batch)
+                       or args.symmetry or args.stats or args.checkpoint or "bitboard" in (args.engine or [])):
+        parser.error("--first cannot be combined with --count-only, --limit, --jobs (except with --batch), "
+                     "--symmetry, --stats, --checkpoint or --engine bitboard")
+    if args.ordering is not None:
+        try:
+            from ordering import format_spec, parse_spec
+            args.ordering = format_spec(parse_spec(args.ordering))
+        except ValueError as e:
+            parser.error(str(e))
+    if args.ordering and args.auto_tune:
+        parser.error("choose only one of --ordering / --auto-tune")
+    if (args.ordering or args.auto_tune) and args.checkpoint:
+        parser.error("--ordering and --auto-tune cannot be combined with --checkpoint")
+    if args.symmetry and (args.auto_tune or (args.ordering and not args.ordering.endswith(",identity"))):
+        parser.error("--symmetry needs row-major row order: use --ordering P,S,identity without --auto-tune")
+    if args.heuristic != "mrv" and (args.jobs > 1 or args.symmetry or args.checkpoint):
+        parser.error("--heuristic other than mrv cannot be combined with --jobs, --symmetry or --checkpoint")
+    if args.checkpoint and (not args.count_only or args.jobs > 1 or args.symmetry):
+        parser.error("--checkpoint requires --count-only and cannot be combined with --jobs or --symmetry")
+    if args.memo and (not args.count_only or args.jobs > 1 or args.symmetry or args.checkpoint):
+        parser.error("--memo requires --count-only and cannot be combined with --jobs, --symmetry or --checkpoint")
+    if args.memo_size < 1:
+        parser.error("--memo-size must be at least 1")
+    if args.jobs > 1 and args.limit is not None:
+        parser.error("--limit cannot be combined with --jobs")
+    if args.symmetry and (args.jobs > 1 or args.limit is not None):
+        parser.error("--symmetry cannot be combined with --jobs or --limit")
+    if args.unique and not args.symmetry:
+        parser.error("--unique requires --symmetry")
+    engines = args.engine or []
+    dlx_engines = [engine for engine in engines if engine != "bitboard"]
+    if len(set(dlx_engines)) > 1:
+        parser.error("choose only one of --engine linked / --engine array")
+    args.dlx_engine = dlx_engines[0] if dlx_engines else "linked"
+    args.bitboard = "bitboard" in engines
+    return args
+
+
+def count_solutions(args, cache, n, label, ordering, build, count):
+    """
+    Count the solutions of one ordering with the strategy selected on the command line,
+    answering from the cache when possible. Returns (count, elapsed, cached).
+    """
+    def run():
+        if args.symmetry:
+            from symmetry import count_symmetric
+            total, _, elapsed = count_symmetric(build, n, label, engine=args.dlx_engine)
+            return total, elapsed
+        if args.jobs > 1:
+            from parallel import count_parallel
+            return count_parallel(build, n, label, engine=args.dlx_engine, jobs=args.jobs, depth=args.depth)
+        if args.checkpoint:
+            problem = {"ordering": ordering, "n": n, "engine": args.dlx_engine}
+            path = f"{args.checkpoint}-{ordering}-n{n}.json"
+            return run_checkpointed(args, problem, path)
+        if args.memo:
+            return count_memoized(build, n, label, engine=args.dlx_engine, capacity=args.memo_size,
+                                  heuristic=get_heuristic(args.heuristic, args.seed))
+        return count(n, engine=args.dlx_engine, heuristic=get_heuristic(args.heuristic, args.seed))
+
+    # Comparing heuristics, memoization or parallel and symmetric search is about timing
+    # them, and the cache only records plain searches, so never answer from it.
+    if args.heuristic != "mrv" or args.memo or args.jobs > 1 or args.symmetry:
+        cache = None
+    return cached_count(cache, label, ordering, n, args.dlx_engine, run)
+
+
+def run_checkpointed(args, problem, path, resume_from=None):
+    """
+    Count one problem with periodic checkpoints, optionally resuming a saved position.
+    Returns (count, elapsed), where elapsed includes earlier sessions.
+    """
+    label = LABELS[problem["ordering"]]
+    n = problem["n"]
+    dlx = build_from_template(problem["ordering"], n, problem["engine"])
+    from checkpoint import count_with_checkpoints
+    count, elapsed = count_with_checkpoints(
+        dlx, path, problem, every_seconds=args.checkpoint_seconds, every_nodes=args.checkpoint_nodes,
+        resume_from=resume_from)
+    print(f"[{label}] Counted {count} solutions for {n}-Queens in {elapsed:.4f} seconds "
+          f"(checkpointed to {path}).")
+    return count, elapsed
+
+
+def resume(args):
+    """
+    Rebuild the matrix described by a checkpoint file and finish its count.
+    """
+    from checkpoint import load_checkpoint
+    saved = load_checkpoint(args.resume)
+    problem = saved["problem"]
+    print(f"\nResuming the {problem['n']}-queens count ({LABELS[problem['ordering']]}) "
+          f"at node {saved['state']['nodes']} with {saved['state']['solutions']} solutions so far...")
+    run_checkpointed(args, problem, args.resume, resume_from=saved)
+
+
+def find_solutions(args, cache, n, label, ordering, build, solve):
+    """
+    Enumerate the solutions of one ordering with the strategy selected on the command line,
+    answering from the cache when possible. Returns (results, elapsed, cached).
+    """
+    def run():
+        if args.first:
+            return solve_first(build, n, label, engine=args.dlx_engine, seed=args.seed, restarts=args.restarts,
+                               heuristic=get_heuristic(args.heuristic, args.seed))
+        if args.symmetry:
+            from symmetry import solve_symmetric
+            return solve_symmetric(build, n, label, engine=args.dlx_engine, unique=args.unique)
+        if args.jobs > 1:
+            from parallel import solve_parallel
+            return solve_parallel(build, n, label, engine=args.dlx_engine, jobs=args.jobs, depth=args.depth)
+        return solve(n, engine=args.dlx_engine, limit=args.limit,
+                     heuristic=get_heuristic(args.heuristic, args.seed))
+
+    # Partial or unique-only result sets are not the full solution list, other
+    # heuristics list the solutions in a different order, and parallel or symmetric
+    # searches take a different time than the plain search the cache records.
+    if (args.limit is not None or args.unique or args.first or args.heuristic != "mrv" or args.jobs > 1
+            or args.symmetry):
+        cache = None
+    return cached_solve(cache, label, ordering, n, args.dlx_engine, run)
+
+
+def second_ordering(args, n):
+    """
+    Return (label, cache key, build, count, solve) for the ordering compared against
+    row-major order: organ-pipe by default, or the one chosen by --ordering/--auto-tune.
+    """
+    spec = args.ordering
+    if spec is None and not args.auto_tune:
+        build = template_builder("organ")
+        return (LABELS["organ"], "organ", build, partial(count_nq_organ, build=build),
+                partial(solve_nq_organ, build=build))
+    from ordering import auto_tune, count_ordered, ordered_builder, solve_ordered
+    if args.auto_tune:
+        print(f"\nAuto-tuning the ordering for {n}-Queens on smaller boards...")
+        spec, timings = auto_tune(n, args.dlx_engine)
+        print(f"Picked '{spec}' ({timings[spec]:.4f} s, vs {max(timings.values()):.4f} s for the slowest "
+              f"of {len(timings)} candidates).")
+    key = f"ordering-{spec}" + (f"-s{args.seed}" if "random" in spec else "")
+    return (spec, key, ordered_builder(spec, args.seed),
+            partial(count_ordered, spec=spec, seed=args.seed), partial(solve_ordered, spec=spec, seed=args.seed))
+
+
+def print_summary(args, summary):
+    """
+    Print the runtime comparison table from (n, original_time, second_time, bitboard_time, cached)
+    tuples, where cached holds a flag per time; times answered from the cache are marked with '*'.
+    """
+    print("\n=== Runtime Comparison Summary ===")
+    second = "Organ Pipe (s)" if not (args.ordering or args.auto_tune) else "Ordering (s)"
+    header = f"{'N':>3} | {'Original (s)':>14} | {second:>15} | {'Speedup':>8}"
+    if args.bitboard:
+        header += f" | {'Bitboard (s)':>13}"
+    print(header)
+    print("-" * (len(header) + 1))
+    for n, t1, t2, t3, cached in summary:
+        # Calculate speedup; guard against zero-time
+        speedup = t1 / t2 if t2 > 0 else float('inf')
+        c1, c2, c3 = ("*" if flag else " " for flag in cached)
+        line = f"{n:>3} | {t1:>13.6f}{c1} | {t2:>14.6f}{c2} | {speedup:>8.2f}x"
+        if t3 is not None:
+            line += f" | {t3:>12.6f}{c3}"
+        print(line.rstrip())
+    if any(any(cached) for *_, cached in summary):
+        print("* loaded from the cache: the time of the original search, not of this run")
+
+
+def run_batch(args):
+    """
+    Run every board size in both orderings as one batch on a shared worker pool,
+    printing each result as it finishes, then the runtime comparison table.
+    """
+    sizes = []
+    for arg in args.sizes:
+        try:
+            sizes.append(int(arg))
+        except ValueError:
+            print(f"Board size '{arg}' is not an integer. Skipping.")
+    mode = "count" if args.count_only else "first" if args.first else "solve"
+    second = args.ordering or "organ"
+    jobs = [{"n": n, "engine": args.dlx_engine, "ordering": ordering, "mode": mode, "seed": args.seed}
+            for n in sizes for ordering in ("original", second)]
+    times = {}
+    print(f"\nRunning {len(jobs)} jobs on {args.jobs if args.jobs > 1 else 'all'} CPU(s), largest first...")
+    from batch import BatchRunner, job_label
+    with BatchRunner(args.jobs if args.jobs > 1 else None) as runner:
+        for result in runner.run(jobs):
+            if "error" in result:
+                print(f"[{result.get('n', '?')}] Job failed: {result['error']}")
+                continue
+            n, label = result["n"], job_label(result)
+            details = f"(build {result['build']:.4f} s, worker {result['worker']})"
+            if mode == "count":
+                print(f"[{label}] Counted {result['count']} solutions for {n}-Queens in "
+                      f"{result['elapsed']:.4f} seconds {details}.")
+            elif mode == "first":
+                print(f"[{label}] Found {result['count']} solution for {n}-Queens in "
+                      f"{result['elapsed']:.4f} seconds {details}.")
+            else:
+                print(f"[{label}] Solved {n}-Queens in {result['elapsed']:.4f} seconds with "
+                      f"{result['count']} solutions {details}.")
+            if result["solution"] is not None:
+                print(f"One of the {label.lower()} solutions:")
+                show_solution(n, result["solution"])
+            times[(n, result["ordering"])] = result["elapsed"]
+
+    print_summary(args, [(n, times[(n, "original")], times[(n, second)], None, (False, False, False))
+                         for n in sizes if (n, "original") in times and (n, second) in times])
+
+
+def show_solution(n, perm):
+    """
+    Print a solution as a board, or as its column-per-row permutation for large boards.
+    """
+    if n <= MAX_PRINTED_BOARD:
+        print_solution(n, perm)
+    else:
+        print("Queen column in each row:", " ".join(map(str, perm)))
+
+
+def print_search_stats(search_stats):
+    """
+    Print the work counters of each instrumented search, then its per-depth profile.
+    """
+    print("\n=== Search Statistics ===")
+    print(f"{'N':>3} | {'Ordering':<10} | {'Nodes':>12} | {'Updates':>14} | {'Branching':>9} | {'Solutions':>10}")
+    print("-" * 74)
+    for n, label, stats in search_stats:
+        print(f"{n:>3} | {label:<10} | {stats.nodes:>12} | {stats.updates:>14} | "
+              f"{stats.average_branching():>9.2f} | {stats.solutions:>10}")
+    for n, label, stats in search_stats:
+        top = ", ".join(f"{name} x{count}" for name, count in stats.choices.most_common(3))
+        print(f"\n{label}, n={n}: most chosen columns: {top or '-'}")
+        print(f"{'Depth':>5} | {'Nodes':>12} | {'Branching':>9}")
+        for line in stats.depth_profile():
+            print(line)
+
+
+def main(argv=None):
     """
     Parses command-line arguments (board sizes), invoke solvers for each board size,
     and display solution examples and timing comparison.
     """
+    args = parse_args(argv)
+
+    if args.resume:
+        resume(args)
+        return
+
     # Ensure at least one board size is provided
-    if len(sys.argv) < 2:
-        print("Try the following: $ python3 main.py <board_size> [<board_size2> ...]")
+    if not args.sizes:
+        print("Try the following: $ python3 main.py <board_size> [<board_size2> ...] [options]")
+        print("Run 'python3 main.py --help' for the options.")
         return
 
-    # Store (n, original_time, organ_time) tuples for summary
+    if args.batch:
+        run_batch(args)
+        return
+
+    cache = None if args.no_cache else SolutionCache()
+
+    # Store (n, original_time, organ_time, bitboard_time, cached) tuples for summary;
+    # bitboard_time is None unless the bitboard baseline was requested, and cached
+    # flags which of the three times were loaded from the cache.
     summary = []
+    # Store (n, label, SearchStats) tuples when --stats is given.
+    search_stats = []
+    # Row-major matrices are cloned from templates, like the built-in second ordering.
+    original_build = template_builder("original")
+    preload(args.dlx_engine)  # Keep module loading out of the first timed build
 
     # Process each provided board size
-    for arg in sys.argv[1:]:
+    for arg in args.sizes:
         # Convert argument to integer, skip invalid inputs
         try:
             n = int(arg)
@@ -25,33 +376,70 @@ def main():
             print(f"Board size '{arg}' is not an integer. Skipping.")
             continue
 
+        label, key, build, count, solve = second_ordering(args, n)
+
+        if args.stats:
+            from stats import collect_stats
+            # Measure work done on separate, instrumented runs so the timings stay clean
+            for stats_label, stats_build in (("Original", original_build), (label, build)):
+                dlx = stats_build(n, args.dlx_engine)
+                dlx.set_heuristic(get_heuristic(args.heuristic, args.seed))
+                search_stats.append((n, stats_label, collect_stats(dlx)))
+
+        if args.count_only:
+            # Count in both orders without materializing solutions
+            print(f"\nCounting the {n}-queens solutions using original algorithm...")
+            _, original_time, original_cached = count_solutions(
+                args, cache, n, "Original", "original", original_build,
+                partial(count_n_queens, build=original_build))
+            print(f"\nCounting the {n}-queens solutions using {label.lower()} ordering...")
+            _, organ_time, organ_cached = count_solutions(args, cache, n, label, key, build, count)
+            bitboard_time, bitboard_cached = None, False
+            if args.bitboard:
+                from bitboard import count_bitboard
+                print(f"\nCounting the {n}-queens solutions using the bitboard baseline...")
+                _, bitboard_time, bitboard_cached = cached_count(cache, "Bitboard", "bitboard", n, "bitboard",
+                                                                 lambda: count_bitboard(n))
+            summary.append((n, original_time, organ_time, bitboard_time,
+                            (original_cached, organ_cached, bitboard_cached)))
+            continue
+
         # Run original DLX algorithm in row-major order
         print(f"\nSolving the {n}-queens problem using original algorithm...")
-        original_solutions, original_time = solve_n_queens(n)
+        original_solutions, original_time, original_cached = find_solutions(
+            args, cache, n, "Original", "original", original_build, partial(solve_n_queens, build=original_build))
+
+        # Run DLX with organ-pipe (center-out) or the custom ordering
+        print(f"\nSolving the {n}-queens problem using {label.lower()} ordering...")
+        organ_solutions, organ_time, organ_cached = find_solutions(args, cache, n, label, key, build, solve)
 
-        # Run DLX with organ-pipe (center-out) ordering
-        print(f"\nSolving the {n}-queens problem using organ pipe ordering...")
-        organ_solutions, organ_time = solve_nq_organ(n)
+        # Run the bitmask backtracking baseline if requested
+        bitboard_time, bitboard_cached = None, False
+        if args.bitboard:
+            from bitboard import solve_bitboard
+            print(f"\nSolving the {n}-queens problem using the bitboard baseline...")
+            _, bitboard_time, bitboard_cached = cached_solve(
+                None if args.limit is not None else cache, "Bitboard", "bitboard", n, "bitboard",
+                lambda: solve_bitboard(n, limit=args.limit))
 
         # Collect timings for final comparison
-        summary.append((n, original_time, organ_time))
+        summary.append((n, original_time, organ_time, bitboard_time,
+                        (original_cached, organ_cached, bitboard_cached)))
 
         # Displays one solution from each method
         if original_solutions:
             print("\nOne of the original solutions:")
-            print_solution(n, original_solutions[0])
+            show_solution(n, original_solutions[0])
         if organ_solutions:
-            print("\nOne of the organ pipe solutions:")
-            print_solution(n, organ_solutions[0])
+            print(f"\nOne of the {label.lower()} solutions:")
+            show_solution(n, organ_solutions[0])
 
     # After processing all sizes, print a runtime comparison table
-    print("\n=== Runtime Comparison Summary ===")
-    print(f"{'N':>3} | {'Original (s)':>14} | {'Organ Pipe (s)':>15} | {'Speedup':>8}")
-    print("-" * 50)
-    for n, t1, t2 in summary:
-        # Calculate speedup; guard against zero-time
-        speedup = t1 / t2 if t2 > 0 else float('inf')
-        print(f"{n:>3} | {t1:>14.6f} | {t2:>15.6f} | {speedup:>8.2f}x")
+    print_summary(args, summary)
+
+    if search_stats:
+        print_search_stats(search_stats)
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Default number of subproblem counts kept in the memo table.
+DEFAULT_CAPACITY = 1 << 20
+
+
+@contextmanager
+def recursion_limit(depth):
+    """
+    Context manager: raise the recursion limit to at least `depth` inside the with
+    block, and restore the previous limit when it exits.
+    """
+    previous = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(previous, depth))
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(previous)
+
+
+class MemoStats:
+    """
+    Memo table counters for one memoized count.
+
+    Attributes:
+        hits (int): Subproblems answered from the table.
+        misses (int): Subproblems searched (and then stored).
+        evictions (int): Entries dropped, least recently used first, to stay within capacity.
+        entries (int): Entries left in the table at the end.
+        elapsed (float): Wall-clock time of the count, in seconds.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries = 0
+        self.elapsed = 0.0
+
+    @property
+    def hit_rate(self):
+        """
+        Fraction of memo lookups that were hits (0.0 without lookups).
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SubproblemKeys:
+    """
+    Keys that identify the subproblem left by a partial solution of a DLX matrix.
+
+    The remaining subproblem after any partial solution is fully determined by which
+    columns are covered: a row is still present exactly when none of its columns is.
+    That set is kept as a bitmask of column bits, extended by each chosen row's mask
+    (its own column plus the others it covers). key() adds the secondary columns
+    that have no rows left, so the key is the same for every path that leaves the
+    same rows, e.g. n-Queens placements that differ only in diagonals no open square
+    lies on.
+    """
+
+    def __init__(self, dlx):
+        """
+        Args:
+            dlx (DancingLinks | ArrayDancingLinks): Matrix in its initial state.
+        """
+        self.dlx = dlx
+        # Give every column a bit and precompute the mask of every row, by row index;
+        # rows without a primary column can never be chosen and are left out.
+        primaries = dlx.primary_columns()
+        bits = {c: 1 << k for k, c in enumerate(primaries)}
+        self.row_masks = {}
+        for c in primaries:
+            r = dlx.first_row(c)
+            while r != c:
+                index = dlx.row_of(r)
+                if index not in self.row_masks:
+                    mask = bits[c]
+                    for col in dlx.row_columns(r):
+                        if col not in bits:
+                            bits[col] = 1 << len(bits)
+                        mask |= bits[col]
+                    self.row_masks[index] = mask
+                r = dlx.next_row(r)
+        self.secondaries = list(bits.items())[len(primaries):]  # (column, bit) pairs
+
+    def key(self, covered):
+        """
+        Return the key of the current subproblem, given the mask of covered columns.
+        """
+        # A secondary column without rows left is as good as covered.
+        size = self.dlx.column_size
+        for col, bit in self.secondaries:
+            if not covered & bit and size(col) == 0:
+                covered |= bit
+        return covered
+
+
+class _MemoCounter:
+    """
+    Recursive counting search that reuses the counts of subproblems seen before.
+    """
+
+    def __init__(self, dlx, capacity):
+        self.dlx = dlx
+        self.capacity = capacity
+        self.keys = SubproblemKeys(dlx)
+        self.table = OrderedDict()  # Subproblem key -> number of completions
+        self.stats = MemoStats()
+
+    def count(self, covered):
+        dlx = self.dlx
+        c = dlx.choose_column()
+        if not c:
+            return 1  # Every primary column is covered
+        if dlx.column_size(c) == 0:
+            return 0  # Dead end: too cheap to be worth a table entry
+
+        key = self.keys.key(covered)
+        table = self.table
+        total = table.get(key)
+        if total is not None:
+            table.move_to_end(key)  # Most recently used
+            self.stats.hits += 1
+            return total
+        self.stats.misses += 1
+
+        row_masks = self.keys.row_masks
+        total = 0
+        dlx.cover(c)
+        r = dlx.first_row(c)
+        while r != c:
+            dlx.cover_row(r)
+            total += self.count(covered | row_masks[dlx.row_of(r)])
+            dlx.uncover_row(r)
+            r = dlx.next_row(r)
+        dlx.uncover(c)
+
+        table[key] = total
+        if len(table) > self.capacity:
+            table.popitem(last=False)  # Evict the least recently used entry
+            self.stats.evictions += 1
+        return total
+
+
+def count_memo(dlx, capacity=DEFAULT_CAPACITY):
+    """
+    Count the solutions of a DLX matrix (either engine), memoizing subproblem counts.
+
+    Different branches of the search can leave exactly the same rows to choose from;
+    each such subproblem is searched once and its count reused, in the spirit of
+    Knuth's memoized DLX counting. Whether that pays off depends on the matrix: the
+    key costs a scan of the secondary columns per node, so check the hit rate.
+
+    The table holds at most `capacity` entries and evicts the least recently used
+    one beyond that, so memory stays bounded at the price of re-searching evicted
+    subproblems.
+
+    Args:
+        dlx (DancingLinks | ArrayDancingLinks): Matrix to count; left unchanged.
+        capacity (int): Maximum number of memoized subproblems.
+
+    Returns:
+        tuple: (count, stats)
+            count: int, number of solutions.
+            stats: MemoStats with the hit rate and table usage.
+
+    Raises:
+        ValueError: If capacity is not positive.
+    """
+    if capacity < 1:
+        raise ValueError("memo capacity must be at least 1")
+    counter = _MemoCounter(dlx, capacity)
+    start = time.perf_counter()
+    # The recursion goes one level per chosen row, like search(); leave room for it.
+    with recursion_limit(4 * len(dlx.primary_columns()) + 100):
+        count = counter.count(0)
+    counter.stats.elapsed = time.perf_counter() - start
+    counter.stats.entries = len(counter.table)
+    return count, counter.stats
+
+
+def count_memoized(build, n, label, engine="linked", capacity=DEFAULT_CAPACITY, heuristic=None):
+    """
+    Count the n-Queens solutions with count_memo() and report the memo hit rate.
+
+    Args:
+        build (callable): Matrix builder such as nqueens.build_n_queens.
+        n (int): Board size.
+        label (str): Name used in the progress message, e.g. "Original".
+        engine (str): DLX engine to use, "linked" (default) or "array".
+        capacity (int): Maximum number of memoized subproblems.
+        heuristic (callable | None): Column choice strategy (see heuristics.py).
+
+    Returns:
+        tuple: (count, elapsed)
+    """
+    start = time.time()
+    dlx = build(n, engine)
+    dlx.set_heuristic(heuristic)
+    build_time = time.time() - start
+
+    count, stats = count_memo(dlx, capacity)
+
+    elapsed = time.time() - start
+    print(f"[{label}] Counted {count} solutions for {n}-Queens in {elapsed:.4f} seconds "
+          f"(build {build_time:.4f} s; memo hit rate {stats.hit_rate:.1%}: {stats.hits} hits, "
+          f"{stats.misses} misses, {stats.evictions} evictions).")
+
+    return count, elapsed
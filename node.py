@@ -11,3 +11,4 @@ class Node:
         # Column header node for this data node
         self.column = None  # Set when the node is added to a column
         self.row_data = None  # User-defined payload, such as coordinates for a queen placement
+        self.row_index = None  # Position of the node's row in insertion order
@@ -1,15 +1,13 @@
-from dancing_links import DancingLinks
+from dancing_links import create_dlx_sparse
+from solutions import SolutionSet, to_permutation, positions
 import time
 
 
-def solve_n_queens(n):
+def build_n_queens(n, engine="linked"):
     """
-    Constructs the exact cover matrix for the n-Queens problem and solves it.
-    Returns a list of solutions; each solution is a list of nodes (each with row_data (i, j)).
+    Constructs the exact cover matrix for the n-Queens problem in row-major order.
+    Returns the DLX matrix; each row carries row_data (i, j) for its board cell.
     """
-
-    start = time.time()
-
     columns = []
     # Primary columns: one per row and one per column.
     for i in range(n):
@@ -24,8 +22,6 @@ def solve_n_queens(n):
     for s in range(2 * n - 1):
         columns.append((f"A{s}", False))
 
-    dlx = DancingLinks(columns)
-
     """
     For each cell (i, j), add a row corresponding to placing a queen there.
     The row covers:
@@ -33,32 +29,83 @@ def solve_n_queens(n):
       - Column constraint: "C{j}"
       - Main diagonal: "D{i - j}"
       - Anti-diagonal: "A{i + j}"
+    The rows are passed as column positions in CSR form (4 per row), which skips
+    formatting and looking up a name for every cell.
     """
+    indices = []
     for i in range(n):
         for j in range(n):
-            row = [f"R{i}", f"C{j}", f"D{i - j}", f"A{i + j}"]
-            dlx.add_row(row, row_data=(i, j))
+            indices.extend((i, n + j, 2 * n + (i - j + n - 1), 4 * n - 1 + i + j))
+    row_data = [(i, j) for i in range(n) for j in range(n)]
+    dlx = create_dlx_sparse(columns, range(0, len(indices) + 1, 4), indices, row_data, engine)
+
+    return dlx
 
-    # Search for all solutions.
-    results = []
-    solution = []
-    dlx.search(solution, results)
+
+def iter_n_queens(n, engine="linked", limit=None):
+    """
+    Lazily yields n-Queens solutions in row-major order, one at a time.
+    Each solution is a compact permutation (perm[i] is the queen's column in row i);
+    stops after `limit` solutions if given.
+    """
+    dlx = build_n_queens(n, engine)
+    for solution in dlx.iter_solutions(limit):
+        yield to_permutation(solution, n)
+
+
+def solve_n_queens(n, engine="linked", limit=None, heuristic=None, build=None):
+    """
+    Constructs the exact cover matrix for the n-Queens problem and solves it.
+    Returns the solutions as a SolutionSet of packed permutations, which does not keep
+    the DLX matrix alive. With a `limit`, the search stops after that many solutions.
+    `heuristic` is an optional column choice strategy (see heuristics.py), and `build`
+    an optional builder to use instead of build_n_queens (e.g. a template builder from
+    templates.py). The construction time is printed separately from the total.
+    """
+
+    start = time.time()
+    dlx = (build or build_n_queens)(n, engine)
+    dlx.set_heuristic(heuristic)
+    build_time = time.time() - start  # Matrix construction, reported separately
+
+    # Search for all solutions (or the first `limit` of them).
+    results = SolutionSet(n, (to_permutation(s, n) for s in dlx.iter_solutions(limit)))
 
     total_time = time.time() - start  # Measure the run time of the original
-    print(f"[Original] Solved {n}-Queens in {total_time:.4f} seconds with {len(results)} solutions.")
+    print(f"[Original] Solved {n}-Queens in {total_time:.4f} seconds with {len(results)} solutions "
+          f"(build {build_time:.4f} s).")
 
     return results, total_time
 
 
+def count_n_queens(n, engine="linked", heuristic=None, build=None):
+    """
+    Counts the n-Queens solutions in row-major order without building any solution lists.
+    Returns (count, elapsed) where count is an exact int; `heuristic` and `build` are
+    as in solve_n_queens().
+    """
+    start = time.time()
+    dlx = (build or build_n_queens)(n, engine)
+    dlx.set_heuristic(heuristic)
+    build_time = time.time() - start
+
+    count = dlx.count()
+
+    total_time = time.time() - start
+    print(f"[Original] Counted {count} solutions for {n}-Queens in {total_time:.4f} seconds "
+          f"(build {build_time:.4f} s).")
+
+    return count, total_time
+
+
 def print_solution(n, solution):
     """
-    Prints a board for a given solution (list of nodes with row_data (i, j)).
+    Prints a board for a given solution (a permutation, column per row).
     """
     # Prepare an empty board.
     board = [["." for _ in range(n)] for _ in range(n)]
     # Place queens based on solution.
-    for node in solution:
-        i, j = node.row_data
+    for i, j in positions(solution):
         board[i][j] = "Q"
     # Print the board.
     for row in board:
@@ -0,0 +1,237 @@
+import random
+import time
+from functools import partial
+from dancing_links import create_dlx_sparse
+from organpipe import organ_pipe_order
+from solutions import SolutionSet, to_permutation
+
+# Built-in ordering strategies, applicable to any list of items.
+STRATEGIES = ("identity", "organ", "reverse", "random", "degree", "diagonal")
+
+# The parts of the matrix that can be reordered independently, in spec order.
+PARTS = ("primary", "secondary", "rows")
+
+
+def order_items(items, strategy, seed=None, weight=None):
+    """
+    Return the items permuted by one ordering strategy.
+
+    Args:
+        items (list): Items in their natural order.
+        strategy (str): One of STRATEGIES:
+            identity: natural order.
+            organ: center-out, as organpipe.organ_pipe_order().
+            reverse: natural order reversed.
+            random: shuffled with a private generator seeded by `seed`.
+            degree: ascending weight, i.e. least constrained first (stable).
+            diagonal: descending weight, i.e. most constrained first (stable).
+        seed (int | None): Seed for "random".
+        weight (callable | None): Maps an item to its weight for "degree" and
+            "diagonal"; without it those strategies keep the natural order.
+
+    Raises:
+        ValueError: For an unknown strategy.
+    """
+    if strategy == "identity":
+        return list(items)
+    if strategy == "organ":
+        return [items[k] for k in organ_pipe_order(len(items))]
+    if strategy == "reverse":
+        return list(reversed(items))
+    if strategy == "random":
+        shuffled = list(items)
+        random.Random(seed).shuffle(shuffled)
+        return shuffled
+    if strategy in ("degree", "diagonal"):
+        if weight is None:
+            return list(items)
+        return sorted(items, key=weight, reverse=strategy == "diagonal")
+    raise ValueError(f"Unknown ordering strategy '{strategy}'. Choose from: {', '.join(STRATEGIES)}")
+
+
+def parse_spec(spec):
+    """
+    Parse an ordering spec "PRIMARY[,SECONDARY[,ROWS]]" into a dict keyed by PARTS.
+
+    Missing parts default to "identity", so "organ" is the organ-pipe ordering of
+    organpipe.py and "identity" the row-major ordering of nqueens.py.
+
+    Raises:
+        ValueError: For an unknown strategy or more than three parts.
+    """
+    names = [name.strip() for name in spec.split(",")]
+    if len(names) > len(PARTS):
+        raise ValueError(f"ordering spec '{spec}' has more than {len(PARTS)} parts")
+    for name in names:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown ordering strategy '{name}'. Choose from: {', '.join(STRATEGIES)}")
+    names += ["identity"] * (len(PARTS) - len(names))
+    return dict(zip(PARTS, names))
+
+
+def format_spec(spec):
+    """
+    Return the canonical "primary,secondary,rows" string of a parsed spec.
+    """
+    return ",".join(spec[part] for part in PARTS)
+
+
+def _diagonal_length(n, d):
+    return n - abs(d)
+
+
+def build_ordered(n, engine="linked", primary="identity", secondary="identity", rows="identity",
+                  seed=None):
+    """
+    Build the n-Queens exact cover matrix with independently ordered parts.
+
+    The weights used by the "degree" and "diagonal" strategies are:
+      primary: the number of diagonal squares seen from a row/column line, summed
+               over its cells (central lines see the most);
+      secondary: the length of a diagonal (its degree in the matrix);
+      rows: the lengths of the two diagonals through a cell.
+    Every primary column has degree n, so "degree" leaves the primaries unchanged.
+
+    Args:
+        n (int): Board size (n x n).
+        engine (str): DLX engine to use, "linked" (default) or "array".
+        primary (str): Strategy for the R/C line order (applied to rows and columns alike).
+        secondary (str): Strategy for the D/A diagonal order.
+        rows (str): Strategy for the order in which the cells are added as rows.
+        seed (int | None): Seed for "random" strategies.
+
+    Returns:
+        DancingLinks | ArrayDancingLinks: Matrix whose rows carry row_data (i, j).
+    """
+    def line_weight(k):
+        return sum(_diagonal_length(n, k - j) + _diagonal_length(n, k + j - (n - 1)) for j in range(n))
+
+    def cell_weight(cell):
+        i, j = cell
+        return _diagonal_length(n, i - j) + _diagonal_length(n, i + j - (n - 1))
+
+    lines = order_items(list(range(n)), primary, seed, weight=line_weight)
+    diagonals = [("D", d) for d in range(-(n - 1), n)] + [("A", s) for s in range(2 * n - 1)]
+    diagonals = order_items(diagonals, secondary, seed, weight=lambda item: _diagonal_length(
+        n, item[1] if item[0] == "D" else item[1] - (n - 1)))
+    cells = order_items([(i, j) for i in range(n) for j in range(n)], rows, seed, weight=cell_weight)
+
+    columns = [(f"R{i}", True) for i in lines] + [(f"C{j}", True) for j in lines]
+    columns.extend((f"{kind}{k}", False) for kind, k in diagonals)
+
+    # Rows as column positions in CSR form, 4 per row.
+    rank = {name: position for position, (name, _) in enumerate(columns)}
+    indices = []
+    for i, j in cells:
+        indices.extend((rank[f"R{i}"], rank[f"C{j}"], rank[f"D{i - j}"], rank[f"A{i + j}"]))
+
+    return create_dlx_sparse(columns, range(0, len(indices) + 1, 4), indices, cells, engine)
+
+
+def ordered_builder(spec, seed=None):
+    """
+    Return a build(n, engine) function for a spec, usable by parallel.py and symmetry.py.
+    """
+    return partial(build_ordered, seed=seed, **parse_spec(spec))
+
+
+def solve_ordered(n, spec, engine="linked", limit=None, heuristic=None, seed=None):
+    """
+    Solve n-Queens with a custom ordering; see build_ordered() and parse_spec().
+
+    Returns:
+        tuple: (results, elapsed)
+            results: SolutionSet of solutions packed as permutations.
+            elapsed: float, time taken in seconds.
+    """
+    start = time.time()
+    dlx = ordered_builder(spec, seed)(n, engine)
+    dlx.set_heuristic(heuristic)
+    build_time = time.time() - start
+
+    results = SolutionSet(n, (to_permutation(s, n) for s in dlx.iter_solutions(limit)))
+
+    elapsed = time.time() - start
+    print(f"[{spec}] Solved {n}-Queens in {elapsed:.4f} seconds with {len(results)} solutions "
+          f"(build {build_time:.4f} s).")
+
+    return results, elapsed
+
+
+def count_ordered(n, spec, engine="linked", heuristic=None, seed=None):
+    """
+    Count the n-Queens solutions with a custom ordering, without materializing them.
+
+    Returns:
+        tuple: (count, elapsed)
+    """
+    start = time.time()
+    dlx = ordered_builder(spec, seed)(n, engine)
+    dlx.set_heuristic(heuristic)
+    build_time = time.time() - start
+
+    count = dlx.count()
+
+    elapsed = time.time() - start
+    print(f"[{spec}] Counted {count} solutions for {n}-Queens in {elapsed:.4f} seconds "
+          f"(build {build_time:.4f} s).")
+
+    return count, elapsed
+
+
+# Candidates tried by auto_tune(): every deterministic primary order combined with
+# the most promising row orders. Secondary order does not change the search tree.
+TUNING_CANDIDATES = [
+    f"{primary},identity,{rows}"
+    for primary in ("identity", "organ", "reverse", "diagonal")
+    for rows in ("identity", "organ", "diagonal")
+]
+
+
+def tuning_sizes(n):
+    """
+    Return the smaller board sizes auto_tune() benchmarks on for a target size n.
+
+    These are n-3 and n-2, capped at 9 and 10 so that tuning stays fast for large
+    targets, and raised to at least 4, the smallest size with solutions.
+    """
+    top = min(n - 2, 10)
+    return sorted({max(4, top - 1), max(4, top)})
+
+
+def auto_tune(n, engine="linked", candidates=None, sizes=None, repeat=3):
+    """
+    Pick the ordering that counts fastest on smaller boards, for use at size n.
+
+    Each candidate is timed (build and count, best of `repeat`) on every tuning size;
+    the candidate with the lowest total wins. Search-tree shape changes smoothly
+    with n, so the ranking on the slightly smaller tuning_sizes(n) is a good
+    predictor for n.
+
+    Args:
+        n (int): Target board size.
+        engine (str): DLX engine to tune for.
+        candidates (list[str] | None): Ordering specs; defaults to TUNING_CANDIDATES.
+        sizes (list[int] | None): Tuning sizes; defaults to tuning_sizes(n).
+        repeat (int): Timed runs per candidate and size.
+
+    Returns:
+        tuple: (best, timings)
+            best: str, the winning ordering spec in canonical form.
+            timings: dict mapping each spec to its total time in seconds.
+    """
+    candidates = [format_spec(parse_spec(spec)) for spec in (candidates or TUNING_CANDIDATES)]
+    sizes = sizes or tuning_sizes(n)
+    timings = {}
+    for spec in candidates:
+        build = ordered_builder(spec)
+        total = 0.0
+        for m in sizes:
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                build(m, engine).count()
+                best = min(best, time.perf_counter() - start)
+            total += best
+        timings[spec] = total
+    return min(candidates, key=timings.get), timings
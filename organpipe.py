@@ -1,5 +1,6 @@
 import time
-from dancing_links import DancingLinks
+from dancing_links import create_dlx_sparse
+from solutions import SolutionSet, to_permutation
 
 
 def organ_pipe_order(n):
@@ -32,20 +33,17 @@ def organ_pipe_order(n):
     return order
 
 
-def solve_nq_organ(n):
+def build_nq_organ(n, engine="linked"):
     """
-    Solve the n-Queens problem using DLX with organ-pipe ordering.
+    Build the n-Queens exact cover matrix with organ-pipe ordering.
 
     Args:
         n (int): Board size (n x n).
+        engine (str): DLX engine to use, "linked" (default) or "array".
 
     Returns:
-        tuple: (results, elapsed)
-            results: list of solutions (each a list of DLX nodes with row_data).
-            elapsed: float, time taken in seconds.
+        DancingLinks | ArrayDancingLinks: Matrix whose rows carry row_data (i, j).
     """
-    start = time.time()
-
     # Build column definitions using organ-pipe order for rows and columns
     columns = []
     row_order = organ_pipe_order(n)
@@ -64,21 +62,95 @@ def solve_nq_organ(n):
     for s in range(2 * n - 1):
         columns.append((f"A{s}", False))
 
-    # Initialize DLX
-    dlx = DancingLinks(columns)
-
-    # Add rows for each board cell (i, j)
+    # Add rows for each board cell (i, j) as column positions in CSR form, 4 per row:
+    # R{i} and C{j} sit at their organ-pipe rank, the diagonals after the primaries.
+    row_rank = {i: rank for rank, i in enumerate(row_order)}
+    col_rank = {j: n + rank for rank, j in enumerate(col_order)}
+    indices = []
     for i in range(n):
         for j in range(n):
-            row = [f"R{i}", f"C{j}", f"D{i - j}", f"A{i + j}"]
-            dlx.add_row(row, row_data=(i, j))
+            indices.extend((row_rank[i], col_rank[j], 2 * n + (i - j + n - 1), 4 * n - 1 + i + j))
+    row_data = [(i, j) for i in range(n) for j in range(n)]
+
+    return create_dlx_sparse(columns, range(0, len(indices) + 1, 4), indices, row_data, engine)
+
+
+def iter_nq_organ(n, engine="linked", limit=None):
+    """
+    Lazily yield n-Queens solutions found with organ-pipe ordering.
+
+    Args:
+        n (int): Board size (n x n).
+        engine (str): DLX engine to use, "linked" (default) or "array".
+        limit (int | None): Stop after this many solutions.
+
+    Yields:
+        bytes: One solution as a compact permutation (column per row).
+    """
+    dlx = build_nq_organ(n, engine)
+    for solution in dlx.iter_solutions(limit):
+        yield to_permutation(solution, n)
 
-    # Search for all solutions
-    results = []
-    solution = []
-    dlx.search(solution, results)
+
+def solve_nq_organ(n, engine="linked", limit=None, heuristic=None, build=None):
+    """
+    Solve the n-Queens problem using DLX with organ-pipe ordering.
+
+    Args:
+        n (int): Board size (n x n).
+        engine (str): DLX engine to use, "linked" (default) or "array".
+        limit (int | None): Stop after this many solutions.
+        heuristic (callable | None): Column choice strategy (see heuristics.py);
+            None uses the built-in MRV.
+        build (callable | None): Builder to use instead of build_nq_organ, such as
+            a templates.template_builder() that clones prebuilt matrices.
+
+    Returns:
+        tuple: (results, elapsed)
+            results: SolutionSet of solutions packed as permutations.
+            elapsed: float, time taken in seconds.
+    """
+    start = time.time()
+    dlx = (build or build_nq_organ)(n, engine)
+    dlx.set_heuristic(heuristic)
+    build_time = time.time() - start  # Matrix construction, reported separately
+
+    # Search for all solutions (or the first `limit` of them)
+    results = SolutionSet(n, (to_permutation(s, n) for s in dlx.iter_solutions(limit)))
 
     elapsed = time.time() - start
-    print(f"[Organ Pipe] Solved {n}-Queens in {elapsed:.4f} seconds with {len(results)} solutions.")
+    print(f"[Organ Pipe] Solved {n}-Queens in {elapsed:.4f} seconds with {len(results)} solutions "
+          f"(build {build_time:.4f} s).")
 
     return results, elapsed
+
+
+def count_nq_organ(n, engine="linked", heuristic=None, build=None):
+    """
+    Count the n-Queens solutions with organ-pipe ordering, without materializing them.
+
+    Args:
+        n (int): Board size (n x n).
+        engine (str): DLX engine to use, "linked" (default) or "array".
+        heuristic (callable | None): Column choice strategy (see heuristics.py);
+            None uses the built-in MRV.
+        build (callable | None): Builder to use instead of build_nq_organ, such as
+            a templates.template_builder() that clones prebuilt matrices.
+
+    Returns:
+        tuple: (count, elapsed)
+            count: int, exact number of solutions.
+            elapsed: float, time taken in seconds.
+    """
+    start = time.time()
+    dlx = (build or build_nq_organ)(n, engine)
+    dlx.set_heuristic(heuristic)
+    build_time = time.time() - start
+
+    count = dlx.count()
+
+    elapsed = time.time() - start
+    print(f"[Organ Pipe] Counted {count} solutions for {n}-Queens in {elapsed:.4f} seconds "
+          f"(build {build_time:.4f} s).")
+
+    return count, elapsed
@@ -0,0 +1,135 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from solutions import SolutionSet, to_permutation
+
+# The matrix last built in this worker process, keyed by _builder_key(build), n and engine.
+_worker_matrices = {}
+
+
+def _builder_key(build):
+    """
+    Return a hashable key that is equal for builders that build the same matrix.
+
+    A functools.partial, such as the builders of ordering.ordered_builder(), is
+    unpickled as a new object for every task and never compares equal to the last
+    one, so it is keyed by its function and arguments instead.
+    """
+    if isinstance(build, partial):
+        return build.func, build.args, tuple(sorted(build.keywords.items()))
+    return build
+
+
+def _worker_matrix(build, n, engine):
+    """
+    Return this process's copy of the matrix, building it on first use.
+
+    Every task leaves the matrix exactly as it found it, so one copy per worker is
+    reused for all prefixes instead of being rebuilt for each task. Only the latest
+    matrix is kept, so a worker never holds more than one.
+    """
+    key = (_builder_key(build), n, engine)
+    dlx = _worker_matrices.get(key)
+    if dlx is None:
+        _worker_matrices.clear()
+        dlx = build(n, engine)
+        _worker_matrices[key] = dlx
+    return dlx
+
+
+def _count_prefix(build, n, engine, prefix):
+    """
+    Count the solutions in the subtree below one prefix of chosen rows.
+    """
+    dlx = _worker_matrix(build, n, engine)
+    for index in prefix:
+        dlx.select_row(index)
+    try:
+        return dlx.count()
+    finally:
+        for index in reversed(prefix):
+            dlx.deselect_row(index)
+
+
+def _solve_prefix(build, n, engine, prefix):
+    """
+    Collect the solutions in the subtree below one prefix, including the prefix rows,
+    as a packed SolutionSet so little data has to travel back to the parent.
+    """
+    dlx = _worker_matrix(build, n, engine)
+    chosen = tuple(dlx.row_data[index] for index in prefix)
+    for index in prefix:
+        dlx.select_row(index)
+    try:
+        return SolutionSet(n, (to_permutation(chosen + solution, n) for solution in dlx.iter_solutions()))
+    finally:
+        for index in reversed(prefix):
+            dlx.deselect_row(index)
+
+
+def _run(build, n, engine, jobs, depth, task):
+    """
+    Split the search tree at `depth` and map `task` over the prefixes in a process pool.
+
+    Results come back in prefix order, which is the order the sequential search
+    would have visited the subtrees in.
+    """
+    prefixes = build(n, engine).prefixes(depth)
+    jobs = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(partial(task, build, n, engine), prefixes))
+
+
+def count_parallel(build, n, label, engine="linked", jobs=None, depth=2):
+    """
+    Count the solutions of a matrix in parallel worker processes.
+
+    Args:
+        build (callable): Module-level builder such as nqueens.build_n_queens; each
+            worker calls it to rebuild the matrix.
+        n (int): Board size passed to the builder.
+        label (str): Name used in the progress message, e.g. "Original".
+        engine (str): DLX engine to use, "linked" (default) or "array".
+        jobs (int | None): Number of worker processes; defaults to the CPU count.
+        depth (int): Search-tree level at which to split into independent tasks.
+
+    Returns:
+        tuple: (count, elapsed)
+            count: int, exact number of solutions.
+            elapsed: float, time taken in seconds.
+    """
+    start = time.time()
+
+    count = sum(_run(build, n, engine, jobs, depth, _count_prefix))
+
+    elapsed = time.time() - start
+    print(f"[{label}] Counted {count} solutions for {n}-Queens in {elapsed:.4f} seconds "
+          f"({jobs or os.cpu_count()} jobs).")
+
+    return count, elapsed
+
+
+def solve_parallel(build, n, label, engine="linked", jobs=None, depth=2):
+    """
+    Enumerate all solutions of a matrix in parallel worker processes.
+
+    Takes the same arguments as count_parallel().
+
+    Returns:
+        tuple: (results, elapsed)
+            results: SolutionSet of solutions packed as permutations, in the same order
+                as the sequential search.
+            elapsed: float, time taken in seconds.
+    """
+    start = time.time()
+
+    results = SolutionSet(n)
+    for chunk in _run(build, n, engine, jobs, depth, _solve_prefix):
+        results.extend(chunk)
+
+    elapsed = time.time() - start
+    print(f"[{label}] Solved {n}-Queens in {elapsed:.4f} seconds with {len(results)} solutions "
+          f"({jobs or os.cpu_count()} jobs).")
+
+    return results, elapsed
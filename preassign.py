@@ -0,0 +1,129 @@
+from contextlib import closing, contextmanager
+
+
+def force_rows(dlx, rows):
+    """
+    Force rows into every solution: cover their columns up front, as if chosen.
+
+    The rows are validated before anything changes, so a rejected call leaves the
+    matrix untouched. Forcing can be repeated to add rows to earlier forced ones;
+    release_rows() undoes it. Searches run in between see only the reduced matrix,
+    so their solutions leave out the forced rows.
+
+    Args:
+        dlx (DancingLinks | ArrayDancingLinks): Matrix that is not being searched.
+        rows (iterable[int]): Row indices (in insertion order) to force.
+
+    Raises:
+        IndexError: If a row does not exist.
+        ValueError: If a row is given twice or shares a column with another forced
+            row (the partial solution is infeasible).
+    """
+    rows = list(rows)
+    owner = {}  # Column -> forced row covering it
+    for index in dlx.forced_rows:
+        for col in dlx.row_items(index):
+            owner[col] = index
+    for index in rows:
+        if not 0 <= index < len(dlx.row_data):
+            raise IndexError(f"row {index} does not exist")
+        if index in dlx.forced_rows or rows.count(index) > 1:
+            raise ValueError(f"row {index} is forced twice")
+        for col in dlx.row_items(index):
+            if col in owner:
+                raise ValueError(f"rows {owner[col]} and {index} both cover column {dlx.column_name(col)}")
+            owner[col] = index
+
+    for index in rows:
+        dlx.select_row(index)
+        dlx.forced_rows.append(index)
+
+
+def release_rows(dlx, count=None):
+    """
+    Undo the last `count` forced rows (all of them by default), latest first.
+    """
+    forced = dlx.forced_rows
+    count = len(forced) if count is None else min(count, len(forced))
+    for _ in range(count):
+        dlx.deselect_row(forced.pop())
+
+
+@contextmanager
+def forcing(dlx, rows):
+    """
+    Context manager: force rows for the duration of a with block, then release them.
+
+    Example:
+        with dlx.forcing([5, 17]):
+            count = dlx.count()
+    """
+    rows = list(rows)
+    force_rows(dlx, rows)
+    try:
+        yield dlx
+    finally:
+        release_rows(dlx, len(rows))
+
+
+def rows_for(dlx, data):
+    """
+    Return the row indices of the rows carrying the given row_data, e.g. n-Queens squares.
+
+    Raises:
+        ValueError: If some row_data does not belong to any row.
+    """
+    index = {d: r for r, d in enumerate(dlx.row_data)}
+    try:
+        return [index[d] for d in data]
+    except KeyError as e:
+        raise ValueError(f"no row has data {e.args[0]!r}") from None
+
+
+def completions(dlx, rows, limit=None):
+    """
+    Yield the solutions that contain the given rows, as tuples of row_data with the
+    forced rows first. The matrix is restored when the generator finishes or is closed.
+
+    Raises:
+        IndexError, ValueError: As force_rows(), before the first solution is produced.
+    """
+    rows = list(rows)
+    with forcing(dlx, rows):
+        forced = tuple(dlx.row_data[index] for index in rows)
+        with closing(dlx.iter_solutions(limit)) as solutions:
+            for solution in solutions:
+                yield forced + solution
+
+
+def count_completions(dlx, rows):
+    """
+    Return the number of solutions that contain the given rows (0 if they conflict).
+
+    Raises:
+        IndexError: If a row does not exist.
+    """
+    try:
+        with forcing(dlx, rows):
+            return dlx.count()
+    except ValueError:
+        return 0
+
+
+def find_completion(dlx, rows):
+    """
+    Return one solution containing the given rows, forced rows first, or None if the
+    partial solution cannot be completed. Answers "is this still feasible?" queries.
+
+    Raises:
+        IndexError: If a row does not exist.
+    """
+    rows = list(rows)
+    try:
+        with forcing(dlx, rows):
+            solution = dlx.find_one()
+    except ValueError:
+        return None
+    if solution is None:
+        return None
+    return tuple(dlx.row_data[index] for index in rows) + solution
@@ -0,0 +1,175 @@
+from search_trace import CHOOSE, BACKTRACK, SOLUTION
+
+
+class SearchDriver:
+    """
+    Non-recursive Algorithm X over a DLX matrix (either engine), one step at a time.
+
+    Instead of recursing once per chosen row, the driver keeps its own explicit stack
+    of (column, row node) pairs, in the style of Knuth's non-recursive Algorithm X.
+    This removes the recursion limit, and the search can be advanced in bounded
+    slices with step(budget), e.g. from a GUI event loop, instead of blocking until
+    it completes.
+
+    Solutions are reported as tuples of row_data, in the same order as search().
+    With a trace attached, every row choice, backtrack and solution is also recorded
+    as an event (see search_trace.py); without one, the only cost is a None check per step.
+    """
+
+    ENTER = "enter"  # Next step visits a new search-tree node at the current level
+    ADVANCE = "advance"  # Next step moves to the next row of the deepest level
+
+    def __init__(self, dlx, trace=None):
+        """
+        Args:
+            dlx (DancingLinks | ArrayDancingLinks): Matrix to search; it is restored
+                to its original state once the search finishes or is aborted.
+            trace (SearchTrace | None): Receives choose/backtrack/solution events.
+        """
+        self.dlx = dlx
+        self.trace = trace
+        self.stack = []  # (column, row node) for each level of the partial solution
+        self.mode = self.ENTER
+        self.finished = False
+        self.nodes = 0  # Search-tree nodes visited so far
+        self.solutions = 0  # Solutions found so far
+
+    def step(self, budget=1000):
+        """
+        Advance the search by at most `budget` search-tree nodes.
+
+        Args:
+            budget (int): Maximum number of nodes to visit in this slice.
+
+        Returns:
+            list[tuple]: Solutions found during this slice (possibly empty). Check
+                `finished` to know whether the search is complete.
+        """
+        dlx = self.dlx
+        stack = self.stack
+        trace = self.trace
+        found = []
+        visited = 0
+        while not self.finished:
+            if self.mode == self.ENTER:
+                if visited >= budget:
+                    break
+                visited += 1
+                c = dlx.choose_column()
+                if not c:
+                    # Every primary column is covered: record the solution.
+                    found.append(tuple(dlx.row_data[dlx.row_of(r)] for _, r in stack))
+                    if trace is not None:
+                        trace.emit(SOLUTION, len(stack))
+                    self.mode = self.ADVANCE
+                elif dlx.column_size(c) == 0:
+                    self.mode = self.ADVANCE  # Dead end
+                else:
+                    dlx.cover(c)
+                    r = dlx.first_row(c)
+                    dlx.cover_row(r)
+                    stack.append((c, r))
+                    if trace is not None:
+                        trace.emit(CHOOSE, len(stack) - 1, dlx.row_data[dlx.row_of(r)])
+            else:
+                # Backtrack from the deepest row and try the next row of its column.
+                if not stack:
+                    self.finished = True
+                    break
+                c, r = stack[-1]
+                dlx.uncover_row(r)
+                if trace is not None:
+                    trace.emit(BACKTRACK, len(stack) - 1, dlx.row_data[dlx.row_of(r)])
+                r = dlx.next_row(r)
+                if r == c:
+                    dlx.uncover(c)
+                    stack.pop()
+                else:
+                    dlx.cover_row(r)
+                    stack[-1] = (c, r)
+                    if trace is not None:
+                        trace.emit(CHOOSE, len(stack) - 1, dlx.row_data[dlx.row_of(r)])
+                    self.mode = self.ENTER
+        self.nodes += visited
+        self.solutions += len(found)
+        return found
+
+    def run(self, budget=1000):
+        """
+        Run the search to completion, yielding solutions as they are found.
+
+        Args:
+            budget (int): Nodes per internal step; only affects how often control
+                returns to this generator.
+        """
+        while not self.finished:
+            yield from self.step(budget)
+
+    def count(self, budget=100000):
+        """
+        Run the search to completion and return the number of solutions found overall.
+        """
+        while not self.finished:
+            self.step(budget)
+        return self.solutions
+
+    def state(self):
+        """
+        Return the current search position as plain data, suitable for saving.
+
+        The position is the stack of chosen rows by row index, plus the mode and the
+        running counts; restore() replays it on a freshly built matrix.
+        """
+        return {
+            "rows": [self.dlx.row_of(r) for _, r in self.stack],
+            "mode": self.mode,
+            "finished": self.finished,
+            "nodes": self.nodes,
+            "solutions": self.solutions,
+        }
+
+    def restore(self, state):
+        """
+        Fast-forward a new driver to a position returned by state().
+
+        The matrix must be built exactly like the one the state was taken from and
+        be in its initial state. Each saved row is replayed by choosing the column
+        the search would choose at that level and covering the row within it.
+
+        Raises:
+            ValueError: If the driver has already started or a saved row cannot be
+                found where the search would have chosen it.
+        """
+        if self.stack or self.nodes:
+            raise ValueError("restore() needs a driver that has not started yet")
+        dlx = self.dlx
+        for index in state["rows"]:
+            c = dlx.choose_column()
+            if not c:
+                self.abort()
+                raise ValueError(f"row {index} does not match this matrix: no column left to choose")
+            dlx.cover(c)
+            r = dlx.first_row(c)
+            while r != c and dlx.row_of(r) != index:
+                r = dlx.next_row(r)
+            if r == c:
+                dlx.uncover(c)
+                self.abort()
+                raise ValueError(f"row {index} does not match this matrix: not in column {dlx.column_name(c)}")
+            dlx.cover_row(r)
+            self.stack.append((c, r))
+        self.mode = state["mode"]
+        self.finished = state["finished"]
+        self.nodes = state["nodes"]
+        self.solutions = state["solutions"]
+
+    def abort(self):
+        """
+        Stop the search early and restore the matrix to its original state.
+        """
+        dlx = self.dlx
+        while self.stack:
+            c, r = self.stack.pop()
+            dlx.uncover_row(r)
+            dlx.uncover(c)
+        self.finished = True
@@ -0,0 +1,49 @@
+from collections import deque
+
+# Event kinds, as recorded in SearchTrace.events.
+CHOOSE = "choose"  # A row was chosen (covered) at a depth
+BACKTRACK = "backtrack"  # The row at a depth was undone (uncovered)
+SOLUTION = "solution"  # Every primary column is covered at a depth
+
+DEFAULT_CAPACITY = 10000
+
+
+class SearchTrace:
+    """
+    Bounded stream of search events, filled by a SearchDriver it is attached to.
+
+    Each event is a tuple (kind, depth, row_data), with kind one of CHOOSE, BACKTRACK
+    or SOLUTION (whose row_data is None). Events are kept in a ring buffer: when the
+    consumer falls behind, the oldest ones are dropped, so memory stays bounded no
+    matter how fast the search runs. `dropped` tells a consumer that it missed some
+    and should resynchronize (e.g. from the driver's stack) instead of replaying.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Args:
+            capacity (int): Maximum number of undrained events kept.
+        """
+        self.events = deque(maxlen=capacity)
+        self.emitted = 0  # Events recorded so far, including dropped ones
+        self.drained = 0  # Events handed to the consumer so far
+
+    def emit(self, kind, depth, row_data=None):
+        self.events.append((kind, depth, row_data))
+        self.emitted += 1
+
+    @property
+    def dropped(self):
+        """
+        Number of events overwritten before they could be drained.
+        """
+        return self.emitted - self.drained - len(self.events)
+
+    def drain(self):
+        """
+        Remove and return the buffered events, oldest first, and reset `dropped`.
+        """
+        events = list(self.events)
+        self.events.clear()
+        self.drained = self.emitted
+        return events
@@ -0,0 +1,239 @@
+import mmap
+import os
+import struct
+import time
+
+# Bump whenever a solver change could alter the cached counts or solutions.
+SOLVER_VERSION = 1
+
+# File layout: header, then `stored` permutations of n bytes each (column per row).
+MAGIC = b"NQSC"
+HEADER = struct.Struct("<4sHHQQd")  # magic, format version, n, count, stored, search seconds
+FORMAT_VERSION = 2
+MAX_N = 2 ** (8 * struct.calcsize("<H")) - 1  # Largest board size the header can hold
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir():
+    """
+    Return the cache directory: $NQUEENS_CACHE_DIR, or ~/.cache/dancing-links.
+    """
+    return os.environ.get("NQUEENS_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "dancing-links")
+
+
+class CachedSolutions:
+    """
+    Read-only sequence of solutions backed by a memory-mapped cache file.
+
+    Nothing is copied up front, so opening even a large entry is instant; each item
+    is one solution's permutation as `bytes` (column per row). `elapsed` is the time
+    the original search took, in seconds.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.n, self.count, self._stored, self.elapsed = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a solution cache file")
+
+    def __len__(self):
+        return self._stored
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._stored))]
+        if index < 0:
+            index += self._stored
+        if not 0 <= index < self._stored:
+            raise IndexError("solution index out of range")
+        offset = HEADER.size + index * self.n
+        return self._map[offset:offset + self.n]
+
+    def close(self):
+        self._map.close()
+
+
+class SolutionCache:
+    """
+    On-disk cache of n-Queens counts and solutions with size-bounded LRU eviction.
+
+    Entries are keyed by board size, ordering, engine and kind (plus SOLVER_VERSION):
+    counts and solution lists are separate entries, since each records the time of
+    its own search. Each solution is stored as a permutation packed into n bytes.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory (str | None): Where to keep the cache files; see default_cache_dir().
+            max_bytes (int): Total size above which least recently used entries are evicted.
+        """
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def path(self, ordering, n, engine, kind="solve"):
+        """
+        Return the file path of the entry for (ordering, n, engine), where kind is
+        "solve" for a solution list or "count" for a count.
+        """
+        return os.path.join(self.directory, f"{ordering}-{engine}-{kind}-v{SOLVER_VERSION}-n{n}.nqc")
+
+    def _read_header(self, path):
+        try:
+            with open(path, "rb") as f:
+                header = f.read(HEADER.size)
+        except OSError:
+            return None
+        if len(header) < HEADER.size:
+            return None
+        magic, version, n, count, stored, elapsed = HEADER.unpack(header)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            return None
+        return n, count, stored, elapsed
+
+    def _touch(self, path):
+        """
+        Mark an entry as recently used; eviction removes the oldest mtimes first.
+        """
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def load_count(self, ordering, n, engine):
+        """
+        Return (count, elapsed) for a cached entry, or None if there is no entry.
+        elapsed is the time the original search took, in seconds.
+        """
+        path = self.path(ordering, n, engine, "count")
+        header = self._read_header(path)
+        if header is None:
+            return None
+        self._touch(path)
+        return header[1], header[3]
+
+    def load(self, ordering, n, engine):
+        """
+        Return (solutions, elapsed) for a cached entry, or None if there is no entry.
+        solutions is a CachedSolutions sequence and elapsed the time the original
+        search took, in seconds.
+        """
+        path = self.path(ordering, n, engine)
+        header = self._read_header(path)
+        if header is None or header[2] != header[1]:
+            return None
+        self._touch(path)
+        if header[2] == 0:
+            return [], header[3]  # mmap cannot map an empty payload; nothing to decode anyway
+        solutions = CachedSolutions(path)
+        return solutions, solutions.elapsed
+
+    def store(self, ordering, n, engine, solutions, elapsed):
+        """
+        Store a complete solution list (each a permutation, column per row) and the
+        time the search for it took, in seconds.
+        """
+        if not 0 <= n <= 256:
+            return  # Columns no longer fit in one byte
+        if hasattr(solutions, "tobytes"):
+            payload = solutions.tobytes()  # SolutionSet: already packed
+        else:
+            payload = b"".join(bytes(perm) for perm in solutions)
+        self._write(self.path(ordering, n, engine), n, len(solutions), len(solutions), elapsed, payload)
+
+    def store_count(self, ordering, n, engine, count, elapsed):
+        """
+        Store a solution count and the time the count took.
+        """
+        self._write(self.path(ordering, n, engine, "count"), n, count, 0, elapsed, b"")
+
+    def _write(self, path, n, count, stored, elapsed, payload):
+        if not 0 <= n <= MAX_N:
+            return  # The header cannot hold this board size
+        os.makedirs(self.directory, exist_ok=True)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, n, count, stored, elapsed))
+            f.write(payload)
+        os.replace(temp, path)  # Atomic, so readers never see a partial entry
+        self.evict()
+
+    def evict(self):
+        """
+        Delete least recently used entries until the cache fits in max_bytes.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".nqc"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+def cached_solve(cache, label, ordering, n, engine, solve):
+    """
+    Return (results, elapsed, cached) from the cache, or run `solve()` and cache its
+    results.
+
+    On a cache hit, elapsed is the time the original search took, not the time spent
+    loading the entry, and cached is True so callers can mark it as such.
+
+    Args:
+        cache (SolutionCache | None): Cache to use; None bypasses it.
+        label (str): Name used in the progress message, e.g. "Original".
+        ordering (str): Ordering part of the cache key, e.g. "original" or "organ".
+        n (int): Board size.
+        engine (str): Engine part of the cache key.
+        solve (callable): Runs the solver and returns (results, elapsed).
+    """
+    if cache is None:
+        results, elapsed = solve()
+        return results, elapsed, False
+    start = time.time()
+    entry = cache.load(ordering, n, engine)
+    if entry is not None:
+        results, elapsed = entry
+        print(f"[{label}] Loaded {len(results)} solutions for {n}-Queens from cache in "
+              f"{time.time() - start:.4f} seconds (searched in {elapsed:.4f} seconds).")
+        return results, elapsed, True
+    results, elapsed = solve()
+    cache.store(ordering, n, engine, results, elapsed)
+    return results, elapsed, False
+
+
+def cached_count(cache, label, ordering, n, engine, count):
+    """
+    Return (count, elapsed, cached) from the cache, or run `count()` and cache the total.
+
+    Takes the same arguments as cached_solve(), with `count` returning (count, elapsed).
+    """
+    if cache is None:
+        total, elapsed = count()
+        return total, elapsed, False
+    start = time.time()
+    entry = cache.load_count(ordering, n, engine)
+    if entry is not None:
+        total, elapsed = entry
+        print(f"[{label}] Loaded count of {total} solutions for {n}-Queens from cache in "
+              f"{time.time() - start:.4f} seconds (counted in {elapsed:.4f} seconds).")
+        return total, elapsed, True
+    total, elapsed = count()
+    cache.store_count(ordering, n, engine, total, elapsed)
+    return total, elapsed, False
@@ -0,0 +1,108 @@
+from array import array
+
+
+def _typecode(n):
+    """
+    Return the array typecode that can hold column indices of an n x n board.
+    """
+    return "B" if n <= 256 else "H"
+
+
+def make_permutation(columns):
+    """
+    Pack a list of columns (one per row, in row order) into a compact permutation.
+
+    Returns:
+        bytes | array: `bytes` for boards up to 256 columns, array('H') beyond that.
+    """
+    if len(columns) <= 256:
+        return bytes(columns)
+    return array("H", columns)
+
+
+def to_permutation(solution, n):
+    """
+    Convert a solution of (i, j) placements, in any order, into a compact permutation.
+
+    Args:
+        solution (iterable): Queen placements (i, j), such as the row_data of the
+            rows chosen by DancingLinks.
+        n (int): Board size.
+
+    Returns:
+        bytes | array: perm[i] is the column of the queen in row i.
+    """
+    columns = [0] * n
+    for i, j in solution:
+        columns[i] = j
+    return make_permutation(columns)
+
+
+def positions(perm):
+    """
+    Return the (i, j) queen placements of a permutation, row by row.
+    """
+    return list(enumerate(perm))
+
+
+class SolutionSet:
+    """
+    List-like collection of n-Queens solutions packed into a single array.
+
+    All permutations share one flat `array`, so storing a solution costs n bytes
+    instead of a tuple of tuples (or a list of live DLX nodes). Indexing returns the
+    permutation of one solution.
+    """
+
+    def __init__(self, n, solutions=()):
+        """
+        Args:
+            n (int): Board size.
+            solutions (iterable): Initial permutations (sequences of n columns).
+        """
+        self.n = n
+        self._data = array(_typecode(n))
+        self._count = 0
+        for perm in solutions:
+            self.append(perm)
+
+    def append(self, perm):
+        """
+        Add one solution given as a permutation (sequence of n columns).
+        """
+        self._data.extend(perm)
+        self._count += 1
+
+    def extend(self, other):
+        """
+        Add every solution of another SolutionSet (or iterable of permutations).
+        """
+        if isinstance(other, SolutionSet) and other._data.typecode == self._data.typecode:
+            self._data.extend(other._data)
+            self._count += other._count
+        else:
+            for perm in other:
+                self.append(perm)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("solution index out of range")
+        chunk = self._data[index * self.n:(index + 1) * self.n]
+        return chunk.tobytes() if chunk.typecode == "B" else chunk
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def tobytes(self):
+        """
+        Return all permutations back to back as raw bytes (n bytes each for n <= 256).
+        """
+        return self._data.tobytes()
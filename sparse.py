@@ -0,0 +1,29 @@
+def normalize_sparse(indptr, indices, row_data, column_count):
+    """
+    Validate a CSR-style row description and return it as plain lists.
+
+    NumPy arrays are converted with tolist(), so the build loops work on Python ints.
+    A row_data of None becomes one None payload per row.
+
+    Returns:
+        tuple: (indptr, indices, row_data) as lists.
+
+    Raises:
+        ValueError: If the three sequences are inconsistent or a column position is
+            outside 0..column_count-1.
+    """
+    indptr, indices = _as_list(indptr), _as_list(indices)
+    row_data = [None] * (len(indptr) - 1) if row_data is None else _as_list(row_data)
+    if not indptr or indptr[0] != 0 or indptr[-1] != len(indices):
+        raise ValueError("indptr must start at 0 and end at len(indices)")
+    if any(indptr[r] > indptr[r + 1] for r in range(len(indptr) - 1)):
+        raise ValueError("indptr must be non-decreasing")
+    if len(row_data) != len(indptr) - 1:
+        raise ValueError(f"expected {len(indptr) - 1} row_data entries, got {len(row_data)}")
+    if indices and not 0 <= min(indices) <= max(indices) < column_count:
+        raise ValueError(f"column positions must lie in 0..{column_count - 1}")
+    return indptr, indices, row_data
+
+
+def _as_list(values):
+    return values.tolist() if hasattr(values, "tolist") else list(values)
@@ -0,0 +1,125 @@
+import time
+from collections import Counter
+
+
+class SearchStats:
+    """
+    Work counters for one DLX search, in the spirit of Knuth's node and update counts.
+
+    Attributes:
+        nodes_per_depth (list[int]): Search-tree nodes visited at each depth.
+        updates (int): Link updates, i.e. nodes unlinked from their column by cover().
+        choices (Counter): How often each column was chosen for branching.
+        solutions (int): Number of solutions found.
+        elapsed (float): Wall-clock time of the instrumented search, in seconds.
+    """
+
+    def __init__(self):
+        self.nodes_per_depth = []
+        self.updates = 0
+        self.choices = Counter()
+        self.solutions = 0
+        self.elapsed = 0.0
+
+    @property
+    def nodes(self):
+        """
+        Total number of search-tree nodes.
+        """
+        return sum(self.nodes_per_depth)
+
+    def branching_factors(self):
+        """
+        Return the average number of children per node at each depth.
+        """
+        return [
+            self.nodes_per_depth[d + 1] / self.nodes_per_depth[d]
+            for d in range(len(self.nodes_per_depth) - 1)
+            if self.nodes_per_depth[d]
+        ]
+
+    def average_branching(self):
+        """
+        Return the average number of children over all internal (non-leaf) nodes.
+        """
+        internal = self.nodes - self.nodes_per_depth[-1] if self.nodes_per_depth else 0
+        return (self.nodes - 1) / internal if internal else 0.0
+
+    def depth_profile(self):
+        """
+        Return one formatted line per depth: node count and branching factor.
+        """
+        factors = self.branching_factors()
+        lines = []
+        for depth, count in enumerate(self.nodes_per_depth):
+            factor = f"{factors[depth]:.2f}" if depth < len(factors) else "-"
+            lines.append(f"{depth:>5} | {count:>12} | {factor:>9}")
+        return lines
+
+
+def _record_node(stats, depth):
+    if depth == len(stats.nodes_per_depth):
+        stats.nodes_per_depth.append(0)
+    stats.nodes_per_depth[depth] += 1
+
+
+def _cover_updates(dlx, col):
+    """
+    Return how many nodes cover(col) unlinks: every other node of every row in col.
+    """
+    updates = 0
+    r = dlx.first_row(col)
+    while r != col:
+        updates += dlx.row_length(r) - 1
+        r = dlx.next_row(r)
+    return updates
+
+
+def _cover(dlx, stats, col):
+    stats.updates += _cover_updates(dlx, col)
+    dlx.cover(col)
+
+
+def _visit(dlx, stats, depth):
+    """
+    Mirror the engines' recursive search while recording work.
+
+    This follows the same column choice and row order as count() and search(), so
+    the counters describe exactly the tree those methods explore.
+    """
+    _record_node(stats, depth)
+    c = dlx.choose_column()
+    if not c:
+        stats.solutions += 1
+        return
+    if dlx.column_size(c) == 0:
+        return
+    stats.choices[dlx.column_name(c)] += 1
+
+    _cover(dlx, stats, c)
+    r = dlx.first_row(c)
+    while r != c:
+        # Cover the other columns of this row, counting their updates as well.
+        for col in dlx.row_columns(r):
+            _cover(dlx, stats, col)
+        _visit(dlx, stats, depth + 1)
+        dlx.uncover_row(r)
+        r = dlx.next_row(r)
+    dlx.uncover(c)
+
+
+def collect_stats(dlx):
+    """
+    Run an instrumented search over a DLX matrix (either engine) and return its stats.
+
+    The regular search methods are untouched, so there is no overhead when stats
+    are not requested; the matrix is left exactly as it was found.
+
+    Returns:
+        SearchStats: Node counts per depth, link updates, column choices and solutions.
+    """
+    stats = SearchStats()
+    start = time.perf_counter()
+    _visit(dlx, stats, 0)
+    stats.elapsed = time.perf_counter() - start
+    return stats
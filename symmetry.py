@@ -0,0 +1,154 @@
+import time
+from solutions import SolutionSet, to_permutation
+
+
+def transforms(perm):
+    """
+    Return the 8 images of a solution under the symmetries of the square (D4).
+
+    Args:
+        perm (sequence[int]): Solution as a column-per-row permutation.
+
+    Returns:
+        list[tuple[int]]: The 4 rotations followed by their mirror images.
+    """
+    n = len(perm)
+    images = []
+    current = tuple(perm)
+    for _ in range(4):
+        images.append(current)
+        # Rotate 90 degrees clockwise: the queen at (i, j) moves to (j, n-1-i).
+        rotated = [0] * n
+        for i, j in enumerate(current):
+            rotated[j] = n - 1 - i
+        current = tuple(rotated)
+    # Mirror each rotation left to right.
+    images.extend(tuple(n - 1 - j for j in image) for image in images[:4])
+    return images
+
+
+def canonical(perm):
+    """
+    Return the lexicographically smallest member of a solution's D4 orbit.
+    """
+    return min(transforms(perm))
+
+
+def orbit(perm):
+    """
+    Return the distinct solutions in a solution's D4 orbit, sorted.
+    """
+    return sorted(set(transforms(perm)))
+
+
+def _half_board_prefixes(n):
+    """
+    List the preassigned placements that cover exactly half of the search.
+
+    The first queen is restricted to the left half of row 0. For odd n, the middle
+    column of row 0 is also allowed, with the second queen then restricted to the
+    left half of row 1; mirroring left to right maps every solution outside this
+    set onto exactly one solution inside it.
+    """
+    prefixes = [((0, j),) for j in range(n // 2)]
+    if n % 2 and n > 1:
+        mid = n // 2
+        # (1, mid - 1) attacks (0, mid) diagonally, so it never starts a solution.
+        prefixes.extend(((0, mid), (1, j)) for j in range(mid - 1))
+    return prefixes
+
+
+def iter_half_solutions(build, n, engine="linked"):
+    """
+    Lazily yield the solutions on the half board as permutations.
+
+    Args:
+        build (callable): Matrix builder such as nqueens.build_n_queens; its rows must
+            be added in row-major order so (i, j) is row index i * n + j.
+        n (int): Board size.
+        engine (str): DLX engine to use, "linked" (default) or "array".
+
+    Yields:
+        tuple[int]: One solution as a column-per-row permutation.
+    """
+    if n <= 1:
+        # No first-row choice to split: the empty board and the 1x1 board have
+        # one solution each, which is its own mirror image.
+        yield tuple(range(n))
+        return
+    dlx = build(n, engine)
+    for prefix in _half_board_prefixes(n):
+        indices = [i * n + j for i, j in prefix]
+        for index in indices:
+            dlx.select_row(index)
+        try:
+            for solution in dlx.iter_solutions():
+                yield tuple(to_permutation(prefix + solution, n))
+        finally:
+            for index in reversed(indices):
+                dlx.deselect_row(index)
+
+
+def unique_solutions(build, n, engine="linked"):
+    """
+    Return the fundamental (distinct up to symmetry) solutions, each in canonical form.
+
+    Every orbit has its canonical member on the half board, so keeping only the
+    half-board solutions that are already canonical lists each orbit exactly once.
+    """
+    return [perm for perm in iter_half_solutions(build, n, engine) if perm == canonical(perm)]
+
+
+def count_symmetric(build, n, label, engine="linked"):
+    """
+    Count all and distinct n-Queens solutions while searching only half the board.
+
+    Each fundamental solution is weighted by the size of its orbit (8, 4 or 2).
+
+    Returns:
+        tuple: (total, distinct, elapsed)
+            total: int, number of solutions on the full board.
+            distinct: int, number of solutions up to rotation and reflection.
+            elapsed: float, time taken in seconds.
+    """
+    start = time.time()
+
+    fundamentals = unique_solutions(build, n, engine)
+    total = sum(len(orbit(perm)) for perm in fundamentals)
+
+    elapsed = time.time() - start
+    print(f"[{label}/D4] Counted {total} solutions ({len(fundamentals)} distinct) for {n}-Queens "
+          f"in {elapsed:.4f} seconds.")
+
+    return total, len(fundamentals), elapsed
+
+
+def solve_symmetric(build, n, label, engine="linked", unique=False):
+    """
+    Solve n-Queens from the half board and expand the orbits back to the full set.
+
+    Args:
+        build (callable): Matrix builder, see iter_half_solutions().
+        n (int): Board size.
+        label (str): Name used in the progress message, e.g. "Original".
+        engine (str): DLX engine to use, "linked" (default) or "array".
+        unique (bool): Return only the fundamental solutions instead of all of them.
+
+    Returns:
+        tuple: (results, elapsed)
+            results: SolutionSet of solutions packed as permutations, ordered by orbit.
+            elapsed: float, time taken in seconds.
+    """
+    start = time.time()
+
+    fundamentals = unique_solutions(build, n, engine)
+    if unique:
+        results = SolutionSet(n, fundamentals)
+    else:
+        results = SolutionSet(n, (image for perm in fundamentals for image in orbit(perm)))
+
+    elapsed = time.time() - start
+    print(f"[{label}/D4] Solved {n}-Queens in {elapsed:.4f} seconds with {len(results)} solutions "
+          f"({len(fundamentals)} distinct).")
+
+    return results, elapsed
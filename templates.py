@@ -0,0 +1,137 @@
+import os
+from functools import partial
+from importlib import import_module
+from nqueens import build_n_queens
+from organpipe import build_nq_organ
+from solution_cache import default_cache_dir
+
+# Bump whenever a builder change could alter the matrices stored as templates.
+TEMPLATE_VERSION = 1
+
+# Built-in orderings by name, as used by main.py, batch.py and checkpoints: the
+# matrix builder (with a prebuilt template) and display label of each.
+BUILDERS = {"original": build_n_queens, "organ": build_nq_organ}
+LABELS = {"original": "Original", "organ": "Organ Pipe"}
+
+# Templates already loaded in this process, keyed by (ordering, n).
+_templates = {}
+
+
+def preload(engine):
+    """
+    Import the modules that build_from_template() loads lazily for an engine, so that
+    the first timed build does not include loading them.
+    """
+    if engine == "array":
+        for module in ("pickle", "array_dancing_links"):
+            import_module(module)
+
+
+def template_path(ordering, n, directory=None):
+    """
+    Return the file a template is stored in, next to the solution cache by default.
+    """
+    return os.path.join(directory or default_cache_dir(), f"template-{ordering}-v{TEMPLATE_VERSION}-n{n}.pkl")
+
+
+def _read_template(path):
+    """
+    Unpickle a template file, or return None if it does not hold a matrix.
+
+    The cache directory can be chosen through NQUEENS_CACHE_DIR, so the file is not
+    trusted: the only global it may reference is the ArrayDancingLinks class, whose
+    state is plain lists, tuples, ints and strings. Anything else (a function to
+    call while loading, say) is refused with UnpicklingError.
+    """
+    import pickle
+    from array_dancing_links import ArrayDancingLinks
+
+    class TemplateUnpickler(pickle.Unpickler):
+        def find_class(self, module, name):
+            if (module, name) == (ArrayDancingLinks.__module__, ArrayDancingLinks.__name__):
+                return ArrayDancingLinks
+            raise pickle.UnpicklingError(f"template files may not reference {module}.{name}")
+
+    with open(path, "rb") as f:
+        template = TemplateUnpickler(f).load()
+    if type(template) is not ArrayDancingLinks:
+        return None
+    # The state must at least have the shape of a built matrix.
+    state = vars(template)
+    reference = vars(ArrayDancingLinks([]))
+    if state.keys() != reference.keys() or any(type(state[k]) is not type(v) for k, v in reference.items()):
+        return None
+    return template
+
+
+def load_template(ordering, n, directory=None):
+    """
+    Return the prebuilt array-engine matrix for (ordering, n), in its initial state.
+
+    The template is looked up in this process first, then in its pickle file (read
+    with _read_template()); only if both miss is it built, and then saved for later
+    processes. The returned matrix is shared: clone() it rather than searching it
+    directly.
+
+    Raises:
+        ValueError: For an ordering without a builder.
+    """
+    if ordering not in BUILDERS:
+        raise ValueError(f"No template for ordering '{ordering}'. Choose from: {', '.join(BUILDERS)}")
+    key = (ordering, n)
+    template = _templates.get(key)
+    if template is not None:
+        return template
+
+    # Only array-engine runs get here, so the linked engine never loads pickle.
+    import pickle
+    path = template_path(ordering, n, directory)
+    try:
+        template = _read_template(path)
+    except Exception:  # Missing, damaged or refused: build it again
+        template = None
+    if template is None or len(template.row_data) != n * n:
+        template = BUILDERS[ordering](n, "array")
+        try:
+            # Write atomically, so a concurrent reader never sees half a template.
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, "wb") as f:
+                pickle.dump(template, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, path)
+        except OSError:
+            pass  # A read-only cache only costs the rebuild next time
+    _templates[key] = template
+    return template
+
+
+def build_from_template(ordering, n, engine="linked", directory=None):
+    """
+    Return a fresh n-Queens matrix for an ordering, cloned from its template when possible.
+
+    Array matrices are flat lists, so a clone takes microseconds where a build takes
+    a fraction of a millisecond, and a template read from disk skips the build in a
+    new process. Linked matrices are object graphs that cannot be copied faster
+    than they are built, so the linked engine is built as usual.
+
+    Args:
+        ordering (str): "original" (row-major) or "organ" (organ-pipe).
+        n (int): Board size.
+        engine (str): DLX engine, "linked" (default) or "array".
+        directory (str | None): Where template files live; see template_path().
+    """
+    if engine != "array":
+        if ordering not in BUILDERS:
+            raise ValueError(f"No template for ordering '{ordering}'. Choose from: {', '.join(BUILDERS)}")
+        return BUILDERS[ordering](n, engine)
+    return load_template(ordering, n, directory).clone()
+
+
+def template_builder(ordering):
+    """
+    Return a build(n, engine) function for a built-in ordering that clones its matrices
+    from templates (see build_from_template()). It pickles, so worker processes can use it.
+    """
+    if ordering not in BUILDERS:
+        raise ValueError(f"No template for ordering '{ordering}'. Choose from: {', '.join(BUILDERS)}")
+    return partial(build_from_template, ordering)
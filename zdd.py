@@ -0,0 +1,391 @@
+import json
+import random
+import struct
+import sys
+import time
+from array import array
+from itertools import islice
+from memo import SubproblemKeys, recursion_limit
+
+# Terminal nodes: the empty family (no solution) and the family holding only the
+# empty set (the current partial solution is complete).
+BOTTOM = 0
+TOP = 1
+
+# File layout: header, then the row, lo and hi arrays (4 bytes per entry, little-endian),
+# then the row data as one JSON list.
+MAGIC = b"NQZD"
+HEADER = struct.Struct("<4sHQQQ")  # magic, format version, root, node count, row data bytes
+FORMAT_VERSION = 1
+
+
+def _as_data(value):
+    """
+    Return row data read back from JSON, with lists turned back into (hashable) tuples.
+    """
+    return tuple(_as_data(v) for v in value) if isinstance(value, list) else value
+
+
+def _data_key(value):
+    """
+    Return a hashable stand-in for row data, so rows with list or object data can be looked up.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _data_key(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_data_key(v) for v in value)
+    return value
+
+
+class ZDD:
+    """
+    Zero-suppressed decision diagram of a family of exact-cover solutions.
+
+    Every non-terminal node stands for the family lo | {row} x hi: the solutions that
+    use one of the other rows of a column, plus those that use `row` together with
+    a solution of the subproblem `row` leaves. The rows of a chain are alternatives
+    for the same column, so the two parts never overlap and counts simply add up.
+    Identical nodes are shared, and so are repeated subproblems (see build_zdd()),
+    so the diagram can be far smaller than the list of solutions.
+
+    Nodes are numbered from 2 upwards, children before parents; the arrays are
+    indexed by node number (entries 0 and 1 belong to the terminals).
+    """
+
+    def __init__(self, row_data, rows=None, lo=None, hi=None, root=BOTTOM):
+        """
+        Args:
+            row_data (list): Payload of each row, by row index, as in the DLX matrix.
+            rows, lo, hi (array | None): Row index and children of each node.
+            root (int): Node holding the whole family.
+        """
+        self.row_data = row_data
+        self.rows = rows if rows is not None else array("I", (0, 0))
+        self.lo = lo if lo is not None else array("I", (0, 0))
+        self.hi = hi if hi is not None else array("I", (0, 0))
+        self.root = root
+        self._unique = None  # (row, lo, hi) -> node, built on demand
+        self._counts = None  # Number of solutions below each node, computed on demand
+
+    def __len__(self):
+        """
+        Number of nodes, terminals included.
+        """
+        return len(self.rows)
+
+    def node(self, row, lo, hi):
+        """
+        Return the node for lo | {row} x hi, creating it unless an identical one exists.
+        """
+        if hi == BOTTOM:
+            return lo  # Zero suppression: no solution uses this row
+        if self._unique is None:
+            self._unique = {(self.rows[k], self.lo[k], self.hi[k]): k for k in range(2, len(self.rows))}
+        key = (row, lo, hi)
+        k = self._unique.get(key)
+        if k is None:
+            k = len(self.rows)
+            self.rows.append(row)
+            self.lo.append(lo)
+            self.hi.append(hi)
+            self._unique[key] = k
+            self._counts = None
+        return k
+
+    def counts(self):
+        """
+        Return the number of solutions below every node, as a list indexed by node.
+        """
+        if self._counts is None or len(self._counts) != len(self.rows):
+            counts = [0, 1]
+            lo, hi = self.lo, self.hi
+            for k in range(2, len(self.rows)):
+                counts.append(counts[lo[k]] + counts[hi[k]])
+            self._counts = counts
+        return self._counts
+
+    def count(self):
+        """
+        Return the number of solutions in the family, without enumerating them.
+        """
+        return self.counts()[self.root]
+
+    def __iter__(self):
+        """
+        Yield every solution as a tuple of row_data, in search order.
+        """
+        rows, lo, hi, row_data = self.rows, self.lo, self.hi, self.row_data
+        stack = [(self.root, ())]
+        while stack:
+            k, prefix = stack.pop()
+            if k == TOP:
+                yield prefix
+            elif k != BOTTOM:
+                # Push lo first so the solutions using `row` come out first.
+                stack.append((lo[k], prefix))
+                stack.append((hi[k], prefix + (row_data[rows[k]],)))
+
+    def sample(self, rng=None):
+        """
+        Return one solution drawn uniformly at random, or None for an empty family.
+
+        Args:
+            rng (random.Random | None): Random generator; defaults to the module's.
+        """
+        counts = self.counts()
+        if counts[self.root] == 0:
+            return None
+        rng = rng or random
+        solution = []
+        k = self.root
+        while k != TOP:
+            # Take the row with probability (its solutions) / (all solutions here).
+            if rng.randrange(counts[k]) < counts[self.hi[k]]:
+                solution.append(self.row_data[self.rows[k]])
+                k = self.hi[k]
+            else:
+                k = self.lo[k]
+        return tuple(solution)
+
+    def restrict(self, *data):
+        """
+        Return the sub-family of the solutions that use every row with the given row_data.
+
+        Each restriction is one pass over the nodes, so queries like "solutions with a
+        queen at (i, j)" take linear time in the diagram size, with no search.
+
+        Raises:
+            KeyError: If some row_data does not belong to any row.
+        """
+        if not data:
+            return self
+        index = {_data_key(d): r for r, d in enumerate(self.row_data)}
+        result = self
+        for d in data:
+            key = _data_key(d)
+            if key not in index:
+                raise KeyError(d)
+            result = result._restrict_row(index[key])
+        return result
+
+    def _restrict_row(self, row):
+        result = ZDD(self.row_data, array("I", self.rows), array("I", self.lo), array("I", self.hi), self.root)
+        rows, lo, hi = self.rows, self.lo, self.hi
+        # with_row[k]: the node for the solutions below k that use `row`.
+        with_row = [BOTTOM, BOTTOM]
+        for k in range(2, self.root + 1):
+            if rows[k] == row:
+                branch = hi[k]  # Already uses `row`: keep its completions as they are
+            else:
+                branch = with_row[hi[k]]
+            with_row.append(result.node(rows[k], with_row[lo[k]], branch))
+        result.root = with_row[self.root]
+        return result
+
+    def save(self, path):
+        """
+        Write the diagram to a compact binary file; see load().
+        """
+        data = json.dumps(self.row_data, separators=(",", ":")).encode()
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.root, len(self.rows), len(data)))
+            for values in (self.rows, self.lo, self.hi):
+                values = array("I", values)
+                if sys.byteorder != "little":
+                    values.byteswap()
+                values.tofile(f)
+            f.write(data)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a diagram written by save().
+
+        Raises:
+            ValueError: If the file is not a ZDD file of a supported version.
+        """
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ValueError(f"{path} is not a ZDD file")
+            magic, version, root, size, data_bytes = HEADER.unpack(header)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} is not a ZDD file")
+            arrays = []
+            for _ in range(3):
+                values = array("I")
+                values.fromfile(f, size)
+                if sys.byteorder != "little":
+                    values.byteswap()
+                arrays.append(values)
+            row_data = [_as_data(d) for d in json.loads(f.read(data_bytes))]
+        return cls(row_data, *arrays, root=root)
+
+
+class _ZDDBuilder:
+    """
+    Memoized search (Knuth's DXZ) that returns a diagram node per subproblem.
+    """
+
+    def __init__(self, dlx):
+        self.dlx = dlx
+        self.keys = SubproblemKeys(dlx)
+        self.zdd = ZDD(dlx.row_data)
+        self.table = {}  # Subproblem key -> node
+
+    def build(self, covered):
+        dlx = self.dlx
+        c = dlx.choose_column()
+        if not c:
+            return TOP
+        if dlx.column_size(c) == 0:
+            return BOTTOM
+
+        key = self.keys.key(covered)
+        k = self.table.get(key)
+        if k is not None:
+            return k
+
+        row_masks = self.keys.row_masks
+        branches = []  # (row index, node of its subproblem), in search order
+        dlx.cover(c)
+        r = dlx.first_row(c)
+        while r != c:
+            dlx.cover_row(r)
+            index = dlx.row_of(r)
+            branches.append((index, self.build(covered | row_masks[index])))
+            dlx.uncover_row(r)
+            r = dlx.next_row(r)
+        dlx.uncover(c)
+
+        # Chain the rows of the column, last first, so the first row heads the chain.
+        k = BOTTOM
+        for index, branch in reversed(branches):
+            k = self.zdd.node(index, k, branch)
+        self.table[key] = k
+        return k
+
+
+def build_zdd(dlx):
+    """
+    Run a memoized search over a DLX matrix (either engine) and return its solutions as a ZDD.
+
+    Args:
+        dlx (DancingLinks | ArrayDancingLinks): Matrix to solve; left unchanged.
+
+    Returns:
+        ZDD: The family of all solutions, over the matrix's row_data.
+    """
+    builder = _ZDDBuilder(dlx)
+    # The recursion goes one level per chosen row, like search(); leave room for it.
+    with recursion_limit(4 * len(dlx.primary_columns()) + 100):
+        builder.zdd.root = builder.build(0)
+    return builder.zdd
+
+
+def zdd_n_queens(build, n, label, engine="linked", heuristic=None):
+    """
+    Build the ZDD of all n-Queens solutions for one ordering.
+
+    Args:
+        build (callable): Matrix builder such as nqueens.build_n_queens.
+        n (int): Board size.
+        label (str): Name used in the progress message, e.g. "Original".
+        engine (str): DLX engine to use, "linked" (default) or "array".
+        heuristic (callable | None): Column choice strategy (see heuristics.py).
+
+    Returns:
+        tuple: (zdd, elapsed)
+            zdd: ZDD whose row_data are (row, column) squares.
+            elapsed: float, time taken in seconds.
+    """
+    start = time.time()
+    dlx = build(n, engine)
+    dlx.set_heuristic(heuristic)
+    build_time = time.time() - start
+
+    zdd = build_zdd(dlx)
+
+    elapsed = time.time() - start
+    print(f"[{label}] Built the ZDD of {zdd.count()} solutions for {n}-Queens with {len(zdd)} nodes "
+          f"in {elapsed:.4f} seconds (build {build_time:.4f} s).")
+
+    return zdd, elapsed
+
+
+def _parse_data(text):
+    """
+    Parse row data given on the command line: comma-separated values, where integers
+    become ints, e.g. "3,5" -> (3, 5) for an n-Queens square or "A,D,G" -> ("A", "D", "G").
+    """
+    return tuple(int(t) if t.lstrip("-").isdigit() else t for t in text.split(","))
+
+
+def main(argv=None):
+    """
+    Command-line entrypoint: build a ZDD file, then count, sample or list from it.
+    """
+    import argparse
+    from exact_cover import format_solution, load_matrix
+    from templates import BUILDERS, LABELS
+
+    parser = argparse.ArgumentParser(
+        description="Store all exact-cover solutions as a ZDD and answer queries without searching again."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="search once and write the ZDD of all solutions")
+    build.add_argument("source", help="n-Queens board size, or an exact-cover matrix file (see exact_cover.py)")
+    build.add_argument("file", help="ZDD file to write")
+    build.add_argument("--engine", choices=["linked", "array"], default="linked",
+                       help="DLX engine (default: linked)")
+    build.add_argument("--ordering", choices=list(BUILDERS), default="organ",
+                       help="n-Queens matrix ordering (default: organ)")
+    for name, help_text in (("count", "count the solutions"), ("sample", "print uniformly random solutions"),
+                            ("list", "print the solutions")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("file", help="ZDD file written by 'build'")
+        command.add_argument("--with", dest="rows", action="append", type=_parse_data, default=[],
+                             metavar="DATA", help="only solutions using this row, e.g. 0,3 for a queen at "
+                                                  "row 0, column 3 (may be repeated)")
+    commands.choices["sample"].add_argument("--samples", type=int, default=1, help="how many (default: 1)")
+    commands.choices["sample"].add_argument("--seed", type=int, default=None, help="random seed")
+    commands.choices["list"].add_argument("--limit", type=int, default=None, help="print at most this many")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if args.source.isdigit():
+            zdd, _ = zdd_n_queens(BUILDERS[args.ordering], int(args.source), LABELS[args.ordering],
+                                  engine=args.engine)
+        else:
+            start = time.time()
+            try:
+                zdd = build_zdd(load_matrix(args.source, args.engine))
+            except (OSError, ValueError) as e:
+                parser.error(str(e))
+            print(f"[{args.source}] Built the ZDD of {zdd.count()} solutions with {len(zdd)} nodes "
+                  f"in {time.time() - start:.4f} seconds.")
+        zdd.save(args.file)
+        return
+
+    start = time.time()
+    try:
+        zdd = ZDD.load(args.file).restrict(*args.rows)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    except KeyError as e:
+        parser.error(f"no row has data {e.args[0]!r}")
+    if args.command == "count":
+        print(f"[{args.file}] {zdd.count()} solutions ({time.time() - start:.4f} seconds).")
+        return
+    if args.command == "sample":
+        rng = random.Random(args.seed)
+        solutions = (zdd.sample(rng) for _ in range(args.samples if zdd.count() else 0))
+    else:
+        solutions = islice(zdd, args.limit)
+    for found, solution in enumerate(solutions, 1):
+        print(f"\nSolution {found}:")
+        print(format_solution(solution))
+
+
+if __name__ == "__main__":
+    main()